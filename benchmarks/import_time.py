@@ -0,0 +1,128 @@
+"""
+Import-time budget check for the agentbeats entry points.
+
+Runs each target in a fresh interpreter under `python -X importtime`, then
+reports total import time, the most expensive top-level packages (by self
+time, summed over their submodules) and the slowest individual imports (by
+cumulative time). A target is a module name, imported with `import <module>`,
+or a command line starting with a script path, e.g.
+"scenarios/debate/debater.py --help".
+
+Budgets in milliseconds are read from pyproject.toml:
+
+    [tool.agentbeats.import-budget]
+    "agentbeats.run_scenario" = 150
+    "scenarios/debate/debater.py --help" = 200
+
+    python benchmarks/import_time.py                 # check all budgeted targets
+    python benchmarks/import_time.py agentbeats.llm  # report on any target
+
+Exits with status 1 if a target exceeds its budget or fails to run.
+"""
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    wall_ms: float
+    returncode: int
+    imports: list[tuple[str, int, float, float]] = field(default_factory=list)  # (module, depth, self ms, cumulative ms)
+    error: str | None = None
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self_ms for _, _, self_ms, _ in self.imports)
+
+    def by_package(self) -> dict[str, float]:
+        """Self time summed per top-level package."""
+        packages: dict[str, float] = {}
+        for module, _, self_ms, _ in self.imports:
+            package = module.split(".", 1)[0]
+            packages[package] = packages.get(package, 0.0) + self_ms
+        return packages
+
+
+def target_argv(target: str) -> list[str]:
+    args = shlex.split(target)
+    if args[0].endswith(".py"):
+        return [sys.executable, "-X", "importtime", *args]
+    return [sys.executable, "-X", "importtime", "-c", f"import {target}"]
+
+
+def measure(target: str) -> ImportProfile:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")]))
+    start = time.monotonic()
+    proc = subprocess.run(target_argv(target), cwd=ROOT, env=env, capture_output=True, text=True)
+    profile = ImportProfile(target, (time.monotonic() - start) * 1000, proc.returncode)
+    other = []
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m:
+            profile.imports.append((m.group(4), (len(m.group(3)) - 1) // 2, int(m.group(1)) / 1000, int(m.group(2)) / 1000))
+        elif not line.startswith("import time:"):
+            other.append(line)
+    if proc.returncode != 0:
+        profile.error = other[-1] if other else f"exit code {proc.returncode}"
+    return profile
+
+
+def best_of(target: str, repeat: int) -> ImportProfile:
+    """The run with the lowest total import time, to discount disk cache and scheduling noise."""
+    return min((measure(target) for _ in range(repeat)), key=lambda p: (p.error is not None, p.total_ms))
+
+
+def report(profile: ImportProfile, budget: float | None, top: int) -> bool:
+    ok = profile.error is None and (budget is None or profile.total_ms <= budget)
+    verdict = "" if budget is None else f" / budget {budget:.0f} ms -> {'ok' if ok else 'OVER BUDGET'}"
+    print(f"{profile.target}: imports {profile.total_ms:.1f} ms, wall {profile.wall_ms:.1f} ms{verdict}")
+    if profile.error:
+        print(f"  failed: {profile.error}")
+    packages = sorted(profile.by_package().items(), key=lambda kv: kv[1], reverse=True)[:top]
+    print("  top packages (self):  " + ", ".join(f"{name} {ms:.1f}" for name, ms in packages))
+    slowest = sorted(profile.imports, key=lambda i: i[3], reverse=True)[:top]
+    print("  slowest (cumulative): " + ", ".join(f"{name} {cum:.1f}" for name, _, _, cum in slowest))
+    return ok
+
+
+def load_budgets(pyproject: Path) -> dict[str, float]:
+    data = tomllib.loads(pyproject.read_text())
+    return data.get("tool", {}).get("agentbeats", {}).get("import-budget", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of entry points against a budget")
+    parser.add_argument("targets", nargs="*", help="Modules or script command lines (default: all budgeted targets)")
+    parser.add_argument("--pyproject", type=str, default=str(ROOT / "pyproject.toml"),
+                        help="pyproject.toml holding [tool.agentbeats.import-budget]")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target; the fastest is reported")
+    parser.add_argument("--top", type=int, default=8, help="Packages and imports listed per target")
+    args = parser.parse_args()
+
+    budgets = load_budgets(Path(args.pyproject))
+    targets = args.targets or list(budgets)
+    if not targets:
+        parser.error("no targets given and no [tool.agentbeats.import-budget] in pyproject.toml")
+
+    failed = [t for t in targets if not report(best_of(t, args.repeat), budgets.get(t), args.top)]
+    if failed:
+        print(f"{len(failed)}/{len(targets)} targets over budget or failing: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
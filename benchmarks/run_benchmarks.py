@@ -0,0 +1,168 @@
+"""
+End-to-end scenario benchmarks.
+
+Boots a scenario with `agentbeats.run_scenario` against stub participants
+(benchmarks/stub_agent.py) and the fake LLM server, drives N assessments at a
+given concurrency and reports throughput, latency percentiles and per-process
+CPU/RSS. Results are appended to a JSON file for comparison across commits.
+
+    python benchmarks/run_benchmarks.py debate tau2 -n 20 -c 4 -o bench_results.json
+
+Per-turn latency is the time between consecutive `working` status updates of
+an assessment; both green agents emit one such update per participant turn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tomllib
+from pathlib import Path
+
+from agentbeats.client_cli import parse_toml as parse_client_toml
+from agentbeats.loadgen import LoadSettings, generate_load, percentiles, request_variants
+from agentbeats.models import EvalRequest
+from agentbeats.procstats import GroupStats
+from agentbeats.run_scenario import agent_env, parse_toml, probe_agents, start_agents, stop_agents
+
+
+BENCH_DIR = Path(__file__).parent
+SCENARIOS = {
+    "debate": BENCH_DIR / "debate.toml",
+    "tau2": BENCH_DIR / "tau2.toml",
+}
+
+
+async def sample_processes(stats: dict[str, GroupStats], interval: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        for s in stats.values():
+            s.sample()
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+    for s in stats.values():
+        s.sample()
+
+
+async def measure(req: EvalRequest, green_url: str, args, stats: dict[str, GroupStats]):
+    if args.warmup:
+        await generate_load(green_url, request_variants(req, []), LoadSettings(concurrency=1, total=args.warmup))
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_processes(stats, args.sample_interval, stop))
+    try:
+        settings = LoadSettings(concurrency=args.concurrency, total=args.num_assessments)
+        traces, wall, _ = await generate_load(green_url, request_variants(req, []), settings)
+        return traces, wall
+    finally:
+        stop.set()
+        await sampler
+
+
+def bench_scenario(name: str, scenario_path: Path, args) -> dict:
+    cfg = parse_toml(str(scenario_path))
+    req, green_url, _ = parse_client_toml(tomllib.loads(scenario_path.read_text()))
+
+    env = agent_env()
+    env["AGENTBEATS_FAKE_LLM_URL"] = f"http://127.0.0.1:{args.fake_llm_port}"
+    # Stub debaters repeat themselves; cached verdicts would skip the judge call being measured
+    env.setdefault("AGENTBEATS_VERDICT_CACHE_SIZE", "0")
+    sink = None if args.show_logs else subprocess.DEVNULL
+
+    fake_llm_cmd = [sys.executable, "-m", "agentbeats.fake_llm", "--port", str(args.fake_llm_port)]
+    if args.fake_llm_script:
+        fake_llm_cmd += ["--script", args.fake_llm_script]
+    procs = [subprocess.Popen(fake_llm_cmd, env=env, stdout=sink, stderr=sink, start_new_session=True)]
+    # start_agents launches participants in TOML order, then the green agent
+    roles = ["fake_llm"] + [p["role"] for p in cfg["participants"] if p.get("cmd")]
+    if cfg["green_agent"].get("cmd"):
+        roles.append("green_agent")
+
+    print(f"[{name}] starting agents")
+    try:
+        start_agents(cfg, env, sink, procs)
+        readiness = asyncio.run(probe_agents(cfg, timeout=args.startup_timeout, procs=procs[1:]))
+        not_ready = [f"{a.role}: {a.describe()}" for a in readiness if a.ready_after is None]
+        if not_ready:
+            raise RuntimeError(f"{name}: agents did not become ready ({'; '.join(not_ready)})")
+
+        stats = {role: GroupStats(proc.pid) for role, proc in zip(roles, procs)}
+        print(f"[{name}] running {args.num_assessments} assessments at concurrency {args.concurrency}")
+        traces, wall = asyncio.run(measure(req, green_url, args, stats))
+    finally:
+        stop_agents(procs)
+
+    ok = [t for t in traces if t.ok]
+    errors: dict[str, int] = {}
+    for t in traces:
+        if not t.ok:
+            key = t.error or f"state={t.state}"
+            errors[key] = errors.get(key, 0) + 1
+    return {
+        "scenario": name,
+        "num_assessments": len(traces),
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 3),
+        "assessments_per_sec": round(len(ok) / wall, 4) if wall > 0 else 0.0,
+        "success_rate": round(len(ok) / len(traces), 4) if traces else 0.0,
+        "assessment_latency": percentiles([t.finished for t in ok]),
+        "turn_latency": percentiles([g for t in ok for g in t.turn_gaps]),
+        "errors": errors,
+        "startup_seconds": {a.role: round(a.ready_after, 3) for a in readiness},
+        "processes": {role: s.summary() for role, s in stats.items()},
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run end-to-end scenario benchmarks")
+    parser.add_argument("scenarios", nargs="*", default=["debate"],
+                        help=f"Scenarios to run ({', '.join(SCENARIOS)}) or paths to scenario TOML files")
+    parser.add_argument("-n", "--num-assessments", type=int, default=10)
+    parser.add_argument("-c", "--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured assessments to run first")
+    parser.add_argument("-o", "--output", type=str, default="bench_results.json",
+                        help="JSON file the results are appended to")
+    parser.add_argument("--fake-llm-port", type=int, default=8765)
+    parser.add_argument("--fake-llm-script", type=str, default=str(BENCH_DIR / "fake_llm.toml"))
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="Seconds between process samples")
+    parser.add_argument("--startup-timeout", type=int, default=60)
+    parser.add_argument("--show-logs", action="store_true", help="Show agent stdout/stderr")
+    args = parser.parse_args()
+
+    runs = []
+    for name in args.scenarios:
+        path = SCENARIOS.get(name, Path(name))
+        try:
+            runs.append(bench_scenario(name, path, args))
+        except Exception as e:
+            print(f"[{name}] failed: {e}")
+            runs.append({"scenario": name, "error": str(e)})
+        print(json.dumps(runs[-1], indent=2))
+
+    record = {
+        "timestamp": time.time(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+    output = Path(args.output)
+    history = json.loads(output.read_text()) if output.exists() else []
+    history.append(record)
+    output.write_text(json.dumps(history, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
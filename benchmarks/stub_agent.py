@@ -0,0 +1,76 @@
+"""
+Stub purple agent for benchmarks.
+
+Answers every message with a canned response after an optional delay, so that
+benchmarks measure orchestration overhead rather than participant behaviour.
+- debate mode: returns a short argument numbered by turn
+- tau2 mode: returns a "respond" action wrapped in <json>...</json> tags
+"""
+import argparse
+import asyncio
+import json
+from collections import defaultdict
+
+import uvicorn
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard
+from a2a.utils import new_agent_text_message
+
+
+class StubExecutor(AgentExecutor):
+
+    def __init__(self, mode: str, delay: float):
+        self.mode = mode
+        self.delay = delay
+        self.turns: dict[str, int] = defaultdict(int)
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.turns[context.context_id] += 1
+        turn = self.turns[context.context_id]
+        if self.mode == "tau2":
+            action = {"name": "respond", "arguments": {"content": f"Stub reply {turn}. How can I help you?"}}
+            text = f"<json>\n{json.dumps(action)}\n</json>"
+        else:
+            text = f"Stub argument {turn}: this position is supported by evidence, reasoning and relevance to the topic."
+        await event_queue.enqueue_event(new_agent_text_message(text, context_id=context.context_id))
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        raise NotImplementedError
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub purple agent for benchmarks.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
+    parser.add_argument("--port", type=int, default=9019, help="Port to bind the server")
+    parser.add_argument("--card-url", type=str, help="External URL to provide in the agent card")
+    parser.add_argument("--mode", choices=["debate", "tau2"], default="debate", help="Response style")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering")
+    args = parser.parse_args()
+
+    card = AgentCard(
+        name=f"stub_{args.mode}_agent",
+        description="Stub participant for benchmarks.",
+        url=args.card_url or f"http://{args.host}:{args.port}/",
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=StubExecutor(args.mode, args.delay),
+        task_store=InMemoryTaskStore(),
+    )
+    app = A2AStarletteApplication(agent_card=card, http_handler=request_handler)
+    uvicorn.run(app.build(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,27 @@
 # prompt adapted from InspireScore: https://github.com/fywang12/InspireDebate/blob/main/inspirescore.py
 import argparse
+import logging
+from typing import AsyncGenerator
+
 import uvicorn
 from dotenv import load_dotenv
 load_dotenv()
 
-from google.adk.agents import Agent
+from google.adk.agents import Agent, BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.tools import FunctionTool
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 
+from agentbeats.fake_llm import use_fake_llm
+from agentbeats.models import EvalRequest
 from agentbeats.tool_provider import ToolProvider
 from debate_judge_common import DebateEval, debate_judge_agent_card
 
 
-system_prompt = '''
-You are the green agent, the debate moderator and judge for structured debates between agents.
+logger = logging.getLogger("adk_debate_judge")
 
-Participating agents:
-- **pro_debater**: Argues in favor of the topic statement
-- **con_debater**: Argues against the topic statement
 
-Your role is to orchestrate a multi-round debate (facilitate the exchange of arguments), and judge the winner based on the quality of reasoning and evidence.
-
-You will receive a structured input:
-- the URLs used by pro_debater and con_debater - use them to communicate with agents.
-- debate topic
-- number of rounds
-
-Once you receive this, immediately start following instructions below.
-
-### Debate Flow:
-
-1. Orchestrate the debate using the talk_to_agent tool:
-- Opening arguments
-  - Ask the pro debater to present their opening argument on the given topic.
-  - Pass that response to the con debater, asking them to present their opening argument while addressing what the pro debater just said.
-- Remaining rounds
-  - Alternate turns between pro and con debaters.
-  - Each debater is told exactly what their opponent said in the previous turn and asked to respond with their next argument.
-  - Continue this exchange until the specified number of rounds (num_rounds) is reached.
-
-2. After reaching the maximum number of rounds, produce your final response by assessing both sides based on four key criteria: Emotional Appeal, Clarity of Argument and Reasoning, Logical Arrangement of Arguments, and Relevance to Debate Topic.
-For each of the four subdimensions, provide a score from 0 to 1 (with 0 being the lowest and 1 being the highest) for both the **Pro (Affirmative)** side and the **Con (Negative)** side. Additionally, provide a brief analysis for both sides for each subdimension.
-
-Scoring Criteria:
+scoring_criteria = '''Scoring Criteria:
     1. **Emotional Appeal**
         - How effectively does each side connect with the audience emotionally? Does the argument evoke empathy, passion, or values?
         - **0**: No emotional appeal. The argument feels cold or disconnected.
@@ -84,30 +63,169 @@ Please output the result in the following format:
 '''
 
 
+system_prompt = '''
+You are the green agent, the debate moderator and judge for structured debates between agents.
+
+Participating agents:
+- **pro_debater**: Argues in favor of the topic statement
+- **con_debater**: Argues against the topic statement
+
+Your role is to orchestrate a multi-round debate (facilitate the exchange of arguments), and judge the winner based on the quality of reasoning and evidence.
+
+You will receive a structured input:
+- the URLs used by pro_debater and con_debater - use them to communicate with agents.
+- debate topic
+- number of rounds
+
+Once you receive this, immediately start following instructions below.
+
+### Debate Flow:
+
+1. Orchestrate the debate using the talk_to_agent tool:
+- Opening arguments
+  - Ask the pro debater to present their opening argument on the given topic.
+  - Pass that response to the con debater, asking them to present their opening argument while addressing what the pro debater just said.
+- Remaining rounds
+  - Alternate turns between pro and con debaters.
+  - Each debater is told exactly what their opponent said in the previous turn and asked to respond with their next argument.
+  - Continue this exchange until the specified number of rounds (num_rounds) is reached.
+
+2. After reaching the maximum number of rounds, produce your final response by assessing both sides based on four key criteria: Emotional Appeal, Clarity of Argument and Reasoning, Logical Arrangement of Arguments, and Relevance to Debate Topic.
+For each of the four subdimensions, provide a score from 0 to 1 (with 0 being the lowest and 1 being the highest) for both the **Pro (Affirmative)** side and the **Con (Negative)** side. Additionally, provide a brief analysis for both sides for each subdimension.
+
+''' + scoring_criteria
+
+
+# Hybrid mode: Python runs the turns, the LLM only judges the finished transcript
+judge_prompt = '''
+You are the judge of a structured debate between agents.
+
+Participating agents:
+- **pro_debater**: Argued in favor of the topic statement
+- **con_debater**: Argued against the topic statement
+
+Debate topic: {debate_topic}
+
+The debate went as follows:
+{debate_transcript}
+
+Produce your final response by assessing both sides based on four key criteria: Emotional Appeal, Clarity of Argument and Reasoning, Logical Arrangement of Arguments, and Relevance to Debate Topic.
+For each of the four subdimensions, provide a score from 0 to 1 (with 0 being the lowest and 1 being the highest) for both the **Pro (Affirmative)** side and the **Con (Negative)** side. Additionally, provide a brief analysis for both sides for each subdimension.
+
+''' + scoring_criteria
+
+
+class HybridDebateJudge(BaseAgent):
+    """Orchestrates the debate turns in code, following the flow of `system_prompt`,
+    then runs the `judge` LLM agent once on the transcript to produce a DebateEval.
+
+    Expects the structured request shown in the agent card.
+    """
+    judge: LlmAgent
+
+    def __init__(self, name: str, description: str, judge: LlmAgent):
+        super().__init__(name=name, description=description, judge=judge, sub_agents=[judge])
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        text = "".join(part.text or "" for part in (ctx.user_content.parts if ctx.user_content else []))
+        try:
+            request = EvalRequest.model_validate_json(text)
+            topic = request.config["topic"]
+            num_rounds = int(request.config["num_rounds"])
+            pro_url = str(request.participants["pro_debater"])
+            con_url = str(request.participants["con_debater"])
+            transcript = await self.run_debate(pro_url, con_url, topic, num_rounds)
+        except Exception as e:
+            logger.error(f"Debate failed: {e}")
+            # An error event makes to_a2a end the task as failed rather than completed
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                error_code="DEBATE_FAILED",
+                error_message=f"Debate failed: {e}",
+            )
+            return
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            actions=EventActions(state_delta={"debate_topic": topic, "debate_transcript": transcript}),
+        )
+        async for event in self.judge.run_async(ctx):
+            yield event
+
+    async def run_debate(self, pro_url: str, con_url: str, topic: str, num_rounds: int) -> str:
+        # Per-invocation conversation state, so concurrent debates don't share context ids
+        tool_provider = ToolProvider()
+        transcript = []
+
+        async def turn(side: str, url: str, message: str) -> str:
+            response = await tool_provider.talk_to_agent(message, url)
+            logger.info(f"{side}: {response}")
+            transcript.append(f"{side} Argument {len(transcript) // 2 + 1}: {response}")
+            return response
+
+        try:
+            response = await turn("Pro", pro_url, f"Debate Topic: {topic}. Present your opening argument.")
+            response = await turn("Con", con_url, f"Debate Topic: {topic}. Present your opening argument. Your opponent opened with: {response}")
+            for _ in range(num_rounds - 1):
+                response = await turn("Pro", pro_url, f"Your opponent said: {response}. Present your next argument.")
+                response = await turn("Con", con_url, f"Your opponent said: {response}. Present your next argument.")
+        finally:
+            tool_provider.reset()
+        return "\n".join(transcript)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run the A2A debate judge.")
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
     parser.add_argument("--port", type=int, default=9009, help="Port to bind the server")
     parser.add_argument("--card-url", type=str, help="External URL to provide in the agent card")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
+    parser.add_argument("--mode", choices=["agent", "hybrid"], default="agent",
+                        help="agent: the LLM drives every turn through talk_to_agent; hybrid: turns run in code and the LLM only judges")
     args = parser.parse_args()
 
+    use_fake_llm(args.fake_llm)
+
+    description = (
+        "Orchestrate and judge a structured debate between pro and con agents on a given topic with multiple rounds of arguments."
+    )
+    if args.mode == "hybrid":
+        root_agent = HybridDebateJudge(
+            name="debate_moderator",
+            description=description,
+            judge=LlmAgent(
+                name="debate_judge",
+                model="gemini-2.0-flash",
+                description="Judge a finished debate transcript.",
+                instruction=judge_prompt,
+                output_schema=DebateEval,
+                include_contents="none",
+            ),
+        )
+    else:
+        root_agent = agent_mode_judge(description)
+
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a  # pulls in the a2a server stack
+
+    agent_card = debate_judge_agent_card("DebateJudgeADK", args.card_url or f"http://{args.host}:{args.port}/")
+    a2a_app = to_a2a(root_agent, agent_card=agent_card)
+    uvicorn.run(a2a_app, host=args.host, port=args.port)
+
+
+def agent_mode_judge(description: str) -> Agent:
     tool_provider = ToolProvider()
-    root_agent = Agent(
+    return Agent(
         name="debate_moderator",
         model="gemini-2.0-flash",
-        description=(
-            "Orchestrate and judge a structured debate between pro and con agents on a given topic with multiple rounds of arguments."
-        ),
+        description=description,
         instruction=system_prompt,
         tools=[FunctionTool(func=tool_provider.talk_to_agent)],
         output_schema=DebateEval,
         after_agent_callback=lambda callback_context: tool_provider.reset()
     )
 
-    agent_card = debate_judge_agent_card("DebateJudgeADK", args.card_url or f"http://{args.host}:{args.port}/")
-    a2a_app = to_a2a(root_agent, agent_card=agent_card)
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
-
 
 if __name__ == "__main__":
     main()
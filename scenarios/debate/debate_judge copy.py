@@ -3,18 +3,20 @@ import contextlib
 import uvicorn
 import asyncio
 import logging
+import time
+import uuid
 from dotenv import load_dotenv
 from pydantic import BaseModel
-from typing import Literal
+from typing import Any, Literal
 
 load_dotenv()
 
-from google import genai
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    DataPart,
     TaskState,
     Part,
     TextPart,
@@ -23,160 +25,544 @@ from a2a.utils import (
     new_agent_text_message
 )
 
+from agentbeats.fake_llm import use_fake_llm
 from agentbeats.green_executor import GreenAgent, GreenExecutor
+from agentbeats.health import CircuitOpenError, HealthRegistry
+from agentbeats.llm import get_gateway
 from agentbeats.models import EvalRequest, EvalResult
 from agentbeats.tool_provider import ToolProvider
+from agentbeats.verdict_cache import VerdictCache, prompt_version
 
-from debate_judge_common import DebateEval, debate_judge_agent_card
+from debate_judge_common import AGGREGATES, DebateEval, aggregate_panel, aggregate_round_evals, debate_judge_agent_card
+from tournament import Match, Standings, run_tournament, schedule
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("debate_judge")
 
+JUDGE_MODEL = "gemini-2.0-flash"
+DEFAULT_JUDGE_TIMEOUT = 120.0
+DEFAULT_TURN_TIMEOUT = 300.0
+JUDGING_MODES = ("final", "incremental")
+OPENING_MODES = ("sequential", "simultaneous")
+PANEL_TEMPERATURE = 1.0
+
+# prompt adapted from InspireScore: https://github.com/fywang12/InspireDebate/blob/main/inspirescore.py
+JUDGE_SYSTEM_PROMPT = """
+        You are an experienced debate judge tasked with evaluating debates. For each debate, you will assess both sides based on four key criteria: Emotional Appeal, Clarity of Argument and Reasoning, Logical Arrangement of Arguments, and Relevance to Debate Topic.
+
+        For each of the four subdimensions, provide a score from 0 to 1 (with 0 being the lowest and 1 being the highest) for both the **Pro (Affirmative)** side and the **Con (Negative)** side. Additionally, provide a brief analysis for both sides for each subdimension.
+
+        Scoring Criteria:
+            1. **Emotional Appeal**
+                - How effectively does each side connect with the audience emotionally? Does the argument evoke empathy, passion, or values?
+                - **0**: No emotional appeal. The argument feels cold or disconnected.
+                - **1**: Highly engaging emotionally, strongly connects with the audience.
+
+            2. **Clarity of Argument and Reasoning**
+                - Are the arguments clearly presented? Is the reasoning sound and easy to follow?
+                - **0**: The arguments are unclear or confusing.
+                - **1**: The arguments are well-structured and easy to understand.
+
+            3. **Logical Arrangement of Arguments**
+                - Is the argument presented in a logical, coherent manner? Does each point flow into the next without confusion?
+                - **0**: The arguments are disorganized and difficult to follow.
+                - **1**: The arguments follow a clear and logical progression.
+
+            4. **Relevance to Debate Topic**
+                - Does each argument directly address the debate topic? Are there any irrelevant points or off-topic distractions?
+                - **0**: Arguments that stray far from the topic.
+                - **1**: Every argument is focused and relevant to the topic.
+
+        Please output the result in the following format:
+
+        1. **Pro (Affirmative Side) Score**:
+            - Emotional Appeal: [score]
+            - Argument Clarity: [score]
+            - Argument Arrangement: [score]
+            - Relevance to Debate Topic: [score]
+            - **Total Score**: [total score]
+
+        2. **Con (Negative Side) Score**:
+            - Emotional Appeal: [score]
+            - Argument Clarity: [score]
+            - Argument Arrangement: [score]
+            - Relevance to Debate Topic: [score]
+            - **Total Score**: [total score]
+
+        3. **Winner**: [Pro/Con]
+        4. **Reason**: [Provide detailed analysis based on the scores]
+        """
+
+JUDGE_DEBATE_PROMPT = """
+        Evaluate the debate on the topic: '{topic}'
+        Debate analysis process and arguments are as follows:
+        {debate_text}
+        Provide a JSON formatted response with scores and comments for each criterion for both debaters.
+        """
+
+JUDGE_ROUND_PROMPT = """
+        Evaluate round {round_num} of the debate on the topic: '{topic}'
+        The arguments so far are as follows:
+        {debate_text}
+        Score only Pro Argument {round_num} and Con Argument {round_num}, using the earlier arguments as context.
+        Provide a JSON formatted response with scores and comments for each criterion for both debaters.
+        """
+
+# Part of the verdict cache key, so editing a prompt invalidates cached verdicts
+JUDGE_PROMPT_VERSION = prompt_version(JUDGE_SYSTEM_PROMPT, JUDGE_DEBATE_PROMPT, JUDGE_ROUND_PROMPT)
+
+
+def panel_models(config: dict[str, Any]) -> list[str]:
+    """The panel_models config value as a list; a single model name may be given as a string."""
+    models = config.get("panel_models", [JUDGE_MODEL])
+    if isinstance(models, str):
+        models = [models]
+    if not isinstance(models, list) or not models or not all(isinstance(m, str) and m for m in models):
+        raise ValueError("panel_models must be a model name or a non-empty list of model names")
+    return models
+
+
+class JudgePanel:
+    """K judges that score the same transcript concurrently.
+
+    Judges cycle through `models` and each gets its own sampling seed. Judges
+    that miss `deadline` or fail are dropped, and the rest are combined with
+    `aggregate`. Agreement statistics of every verdict are kept in `verdicts`.
+    """
+
+    def __init__(self, size: int, models: list[str], deadline: float | None = None, aggregate: str = "mean"):
+        self.size = size
+        self.models = models
+        self.deadline = deadline
+        self.aggregate = aggregate
+        self.verdicts: list[dict[str, Any]] = []
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "JudgePanel | None":
+        """Panel configured by panel_size, panel_models, judge_deadline and panel_aggregate, or None for a single judge."""
+        size = int(config.get("panel_size", 1))
+        if size <= 1:
+            return None
+        deadline = config.get("judge_deadline")
+        return cls(
+            size=size,
+            models=panel_models(config),
+            deadline=float(deadline) if deadline is not None else None,
+            aggregate=config.get("panel_aggregate", "mean"),
+        )
+
+    async def evaluate(self, llm, system: str, prompt: str) -> DebateEval:
+        async def judge(i: int) -> DebateEval:
+            return await llm.generate_structured(
+                model=self.models[i % len(self.models)],
+                system=system,
+                prompt=prompt,
+                schema=DebateEval,
+                seed=i,
+                temperature=PANEL_TEMPERATURE,
+                cache=False,  # each judge is a deliberate sample
+            )
+
+        tasks = [asyncio.create_task(judge(i)) for i in range(self.size)]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        finally:
+            for task in tasks:
+                task.cancel()
+        evals = []
+        for i, task in enumerate(tasks):
+            if task in done and task.exception() is None:
+                evals.append(task.result())
+            elif task in done:
+                logger.warning(f"Judge {i} failed: {task.exception()}")
+            else:
+                logger.warning(f"Judge {i} missed the {self.deadline}s deadline")
+        if not evals:
+            raise RuntimeError("No judge on the panel returned a verdict")
+
+        verdict, stats = aggregate_panel(evals, self.aggregate)
+        stats["dropped"] = self.size - len(evals)
+        self.verdicts.append(stats)
+        return verdict
+
+
+class Forfeit(Exception):
+    """Raised when a debater forfeits the debate under the forfeit rules."""
+
+    def __init__(self, role: str, reason: str):
+        super().__init__(reason)
+        self.role = role
+        self.reason = reason
+
 
 class DebateJudge(GreenAgent):
-    def __init__(self):
+    def __init__(self, health: HealthRegistry | None = None):
         self._required_roles = ["pro_debater", "con_debater"]
         self._required_config_keys = ["topic", "num_rounds"]
-        self._client = genai.Client()
-        self._tool_provider = ToolProvider()
+        self._llm = get_gateway()
+        # Shared by all assessments, so an endpoint found dead in one debate fails fast in the others
+        self._health = health or HealthRegistry()
+        self._verdicts = VerdictCache.from_env()
 
     def validate_request(self, request: EvalRequest) -> tuple[bool, str]:
-        missing_roles = set(self._required_roles) - set(request.participants.keys())
-        if missing_roles:
-            return False, f"Missing roles: {missing_roles}"
+        if is_tournament(request):
+            if len(request.participants) < 2:
+                return False, "A tournament needs at least two debaters"
+            topics = request.config.get("topics") or request.config.get("topic")
+            if not topics:
+                return False, "Missing config keys: {'topics'}"
+            try:
+                if int(request.config.get("max_matches_per_debater", 1)) < 1:
+                    return False, "max_matches_per_debater must be at least 1"
+                if int(request.config.get("max_concurrent_matches", 0)) < 0:
+                    return False, "max_concurrent_matches must not be negative"
+            except Exception as e:
+                return False, f"Can't parse tournament concurrency: {e}"
+        else:
+            missing_roles = set(self._required_roles) - set(request.participants.keys())
+            if missing_roles:
+                return False, f"Missing roles: {missing_roles}"
         missing_config_keys = set(self._required_config_keys) - set(request.config.keys())
+        if is_tournament(request):
+            missing_config_keys.discard("topic")
         if missing_config_keys:
             return False, f"Missing config keys: {missing_config_keys}"
         try:
             int(request.config["num_rounds"])
         except Exception as e:
             return False, f"Can't parse num_rounds: {e}"
+        try:
+            float(request.config.get("judge_timeout", DEFAULT_JUDGE_TIMEOUT))
+        except Exception as e:
+            return False, f"Can't parse judge_timeout: {e}"
+        try:
+            float(request.config.get("turn_timeout", DEFAULT_TURN_TIMEOUT))
+            if int(request.config.get("forfeit_after", 1)) < 1:
+                return False, "forfeit_after must be at least 1"
+        except Exception as e:
+            return False, f"Can't parse turn_timeout or forfeit_after: {e}"
+        if request.config.get("judging", "final") not in JUDGING_MODES:
+            return False, f"judging must be one of {JUDGING_MODES}"
+        if request.config.get("opening_mode", "sequential") not in OPENING_MODES:
+            return False, f"opening_mode must be one of {OPENING_MODES}"
+        try:
+            panel_models(request.config)
+            JudgePanel.from_config(request.config)
+        except Exception as e:
+            return False, f"Can't parse panel config: {e}"
+        if request.config.get("panel_aggregate", "mean") not in AGGREGATES:
+            return False, f"panel_aggregate must be one of {AGGREGATES}"
         return True, "ok"
 
     async def run_eval(self, req: EvalRequest, updater: TaskUpdater) -> None:
         logger.info(f"Starting debate orchestration: {req}")
 
+        with self._llm.assessment() as llm_usage:
+            if is_tournament(req):
+                await self._run_tournament(req, updater)
+            else:
+                await self._run_debate(req, updater)
+        logger.info(f"LLM usage: {llm_usage.to_dict()}")
+        if self._verdicts.enabled:
+            logger.info(f"Verdict cache: {self._verdicts.stats()}")
+
+    def _tool_provider(self, config: dict[str, Any]) -> ToolProvider:
+        return ToolProvider(health=self._health, timeout=float(config.get("turn_timeout", DEFAULT_TURN_TIMEOUT)))
+
+    async def _run_debate(self, req: EvalRequest, updater: TaskUpdater) -> None:
+        # Per-assessment conversation state, so concurrent debates don't share context ids
+        tool_provider = self._tool_provider(req.config)
+        topic = req.config["topic"]
+        judge_timeout = float(req.config.get("judge_timeout", DEFAULT_JUDGE_TIMEOUT))
+        incremental = req.config.get("judging", "final") == "incremental"
+        panel = JudgePanel.from_config(req.config)
+        # Incremental judging: each round is scored in the background while the next one is argued
+        round_tasks: dict[int, asyncio.Task] = {}
+
+        async def on_round(round_num: int, debate: dict[str, list[str]]) -> None:
+            round_tasks[round_num] = asyncio.create_task(
+                self.judge_round(topic, format_debate(debate), round_num, panel))
+
         try:
-            debate = await self.orchestrate_debate(req.participants,
-                                                req.config["topic"],
-                                                req.config["num_rounds"],
-                                                updater)
-
-            debate_text = ""
-            for i, (pro, con) in enumerate(zip(debate["pro_debater"], debate["con_debater"]), start=1):
-                debate_text += f"Pro Argument {i}: {pro}\n"
-                debate_text += f"Con Argument {i}: {con}\n"
-
-            await updater.update_status(TaskState.working, new_agent_text_message(f"Debate orchestration finished. Starting evaluation."))
-            logger.info("Debate orchestration finished. Evaluating debate.")
-            debate_eval: DebateEval = await self.judge_debate(req.config["topic"], debate_text)
+            try:
+                debate = await self.orchestrate_debate(req.participants,
+                                                    topic,
+                                                    req.config["num_rounds"],
+                                                    updater,
+                                                    tool_provider,
+                                                    on_round if incremental else None,
+                                                    forfeit_after(req.config),
+                                                    req.config.get("opening_mode", "sequential"))
+            except Forfeit as f:
+                winner = "con_debater" if f.role == "pro_debater" else "pro_debater"
+                logger.info(f"{f.role} forfeited: {f.reason}")
+                result = EvalResult(winner=winner, detail={
+                    "forfeit": f.role,
+                    "reason": f.reason,
+                    "participant_health": [self._health.get(str(url)).to_dict() for url in req.participants.values()],
+                })
+                await updater.add_artifact(
+                    parts=[
+                        Part(root=TextPart(text=f"{f.role} forfeited: {f.reason}")),
+                        Part(root=DataPart(data=result.model_dump(mode="json"))),
+                    ],
+                    name="Result",
+                )
+                return
+
+            try:
+                if incremental:
+                    await updater.update_status(TaskState.working, new_agent_text_message(f"Debate orchestration finished. Aggregating round scores."))
+                    logger.info("Debate orchestration finished. Aggregating round scores.")
+                    debate_eval = await asyncio.wait_for(self.collect_round_evals(round_tasks), judge_timeout)
+                else:
+                    await updater.update_status(TaskState.working, new_agent_text_message(f"Debate orchestration finished. Starting evaluation."))
+                    logger.info("Debate orchestration finished. Evaluating debate.")
+                    debate_eval = await asyncio.wait_for(self.judge_debate(topic, format_debate(debate), panel), judge_timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"Judging timed out after {judge_timeout}s")
             logger.info(f"Debate Evaluation:\n{debate_eval.model_dump_json()}")
 
-            result = EvalResult(winner=debate_eval.winner, detail=debate_eval.model_dump())
+            detail = debate_eval.model_dump()
+            if panel:
+                detail["panel"] = panel.verdicts
+            result = EvalResult(winner=debate_eval.winner, detail=detail)
             await updater.add_artifact(
                 parts=[
                     Part(root=TextPart(text=debate_eval.reason)),
-                    Part(root=TextPart(text=result.model_dump_json())),
+                    Part(root=DataPart(data=result.model_dump(mode="json"))),
                 ],
                 name="Result",
             )
         finally:
-            self._tool_provider.reset()
+            for task in round_tasks.values():
+                task.cancel()
+            tool_provider.reset()
+
+    async def _run_tournament(self, req: EvalRequest, updater: TaskUpdater) -> None:
+        endpoints = {name: str(url) for name, url in req.participants.items()}
+        topics = req.config.get("topics") or req.config["topic"]
+        if isinstance(topics, str):
+            topics = [topics]
+        num_rounds = int(req.config["num_rounds"])
+        judge_timeout = float(req.config.get("judge_timeout", DEFAULT_JUDGE_TIMEOUT))
+        matches = schedule(list(endpoints), topics)
+        standings = Standings(list(endpoints))
+        standings_id = str(uuid.uuid4())
+
+        await updater.update_status(TaskState.working, new_agent_text_message(
+            f"Starting tournament: {len(endpoints)} debaters, {len(topics)} topics, {len(matches)} matches."))
+
+        async def play(match: Match) -> None:
+            # Fresh conversations for every match
+            tool_provider = self._tool_provider(req.config)
+            start = time.monotonic()
+            try:
+                participants = {"pro_debater": endpoints[match.pro], "con_debater": endpoints[match.con]}
+                debate = await self.orchestrate_debate(participants, match.topic, num_rounds, None, tool_provider,
+                                                       forfeit_after=forfeit_after(req.config),
+                                                       opening_mode=req.config.get("opening_mode", "sequential"))
+                debate_eval = await asyncio.wait_for(
+                    self.judge_debate(match.topic, format_debate(debate), JudgePanel.from_config(req.config)),
+                    judge_timeout)
+                match.winner = match.pro if debate_eval.winner == "pro_debater" else match.con
+                match.detail = debate_eval.model_dump()
+            except Forfeit as f:
+                match.winner = match.con if f.role == "pro_debater" else match.pro
+                match.detail = {"forfeit": f.role, "reason": f.reason}
+            except Exception as e:
+                logger.warning(f"Match {match.index} ({match.pro} vs {match.con}) failed: {e}")
+                match.error = f"{type(e).__name__}: {e}"
+            finally:
+                match.seconds = time.monotonic() - start
+                tool_provider.reset()
+
+        async def on_result(match: Match) -> None:
+            standings.record(match)
+            finished = standings.played + standings.failed
+            outcome = f"winner {match.winner}" if match.winner else f"failed ({match.error})"
+            await updater.update_status(TaskState.working, new_agent_text_message(
+                f"Match {finished}/{len(matches)}: {match.pro} (pro) vs {match.con} (con) on '{match.topic}': {outcome}"))
+            # Same artifact id every time, so the latest standings replace the previous ones
+            await updater.add_artifact(
+                parts=[Part(root=DataPart(data={
+                    "finished": finished,
+                    "total": len(matches),
+                    "standings": standings.table(),
+                }))],
+                artifact_id=standings_id,
+                name="Standings",
+                last_chunk=finished == len(matches),
+            )
+
+        await run_tournament(
+            matches,
+            play,
+            on_result,
+            max_per_debater=int(req.config.get("max_matches_per_debater", 1)),
+            max_concurrent=int(req.config.get("max_concurrent_matches", 0)) or None,
+        )
+
+        if not standings.played:
+            raise RuntimeError(f"All {len(matches)} matches failed")
+        table = standings.table()
+        result = EvalResult(winner=table[0]["debater"], detail={
+            "standings": table,
+            "matches": [m.to_dict() for m in matches],
+            "failed_matches": standings.failed,
+        })
+        await updater.add_artifact(
+            parts=[
+                Part(root=TextPart(text=f"{table[0]['debater']} won the tournament with Elo {table[0]['elo']}.")),
+                Part(root=DataPart(data=result.model_dump(mode="json"))),
+            ],
+            name="Result",
+        )
 
     async def orchestrate_debate(
         self,
         participants: dict[str, str],
         topic: str,
         num_rounds: int,
-        updater: TaskUpdater,
+        updater: TaskUpdater | None,
+        tool_provider: ToolProvider,
+        on_round=None,
+        forfeit_after: int | None = None,
+        opening_mode: str = "sequential",
     ) -> dict[str, list[str]]:
+        """Runs the debate. `on_round(round_num, debate)` is awaited after each completed round.
+
+        Each turn is reported as a status update unless `updater` is None.
+
+        With `opening_mode="simultaneous"` both openings are requested at once,
+        without showing con the pro opening, and the first rebuttal round starts
+        from both texts: each side's first rebuttal prompt carries its
+        opponent's opening.
+
+        Without `forfeit_after` a failed turn fails the debate. With it, a failed
+        turn is recorded as a missing argument, and a debater forfeits (raising
+        `Forfeit`) after `forfeit_after` failed turns or as soon as its
+        endpoint's circuit is open.
+        """
         debate: dict[str, list[str]] = {"pro_debater": [], "con_debater": []}
+        failed_turns = {"pro_debater": 0, "con_debater": 0}
 
         async def turn(role: str, prompt: str) -> str:
-            response = await self._tool_provider.talk_to_agent(prompt, str(participants[role]), new_conversation=False)
+            try:
+                response = await tool_provider.talk_to_agent(prompt, str(participants[role]), new_conversation=False)
+            except Exception as e:
+                if forfeit_after is None:
+                    raise
+                failed_turns[role] += 1
+                logger.warning(f"{role} failed turn {len(debate[role]) + 1}: {e}")
+                if isinstance(e, CircuitOpenError) or failed_turns[role] >= forfeit_after:
+                    raise Forfeit(role, f"{failed_turns[role]} failed turn(s), last error: {e}") from e
+                response = f"[{role} did not respond]"
             logger.info(f"{role}: {response}")
             debate[role].append(response)
-            await updater.update_status(TaskState.working, new_agent_text_message(f"{role}: {response}"))
+            if updater:
+                await updater.update_status(TaskState.working, new_agent_text_message(f"{role}: {response}"))
             return response
 
         # Opening turns
-        response = await turn("pro_debater", f"Debate Topic: {topic}. Present your opening argument.")
-        response = await turn("con_debater", f"Debate Topic: {topic}. Present your opening argument. Your opponent opened with: {response}")
+        unseen_opening = None  # pro's opening, when con has not been shown it yet
+        if opening_mode == "simultaneous":
+            openings = [
+                asyncio.create_task(turn(role, f"Debate Topic: {topic}. Present your opening argument."))
+                for role in ("pro_debater", "con_debater")
+            ]
+            try:
+                unseen_opening, response = await asyncio.gather(*openings)
+            finally:
+                for task in openings:
+                    task.cancel()
+        else:
+            response = await turn("pro_debater", f"Debate Topic: {topic}. Present your opening argument.")
+            response = await turn("con_debater", f"Debate Topic: {topic}. Present your opening argument. Your opponent opened with: {response}")
+        if on_round:
+            await on_round(1, debate)
 
         # Remaining rounds
-        for _ in range(num_rounds - 1):
-            response = await turn("pro_debater", f"Your opponent said: {response}. Present your next argument.")
-            response = await turn("con_debater", f"Your opponent said: {response}. Present your next argument.")
+        for round_num in range(2, int(num_rounds) + 1):
+            if round_num == 2 and unseen_opening is not None:
+                response = await turn("pro_debater", f"Your opponent opened with: {response}. Present your next argument.")
+                response = await turn("con_debater", f"Your opponent opened with: {unseen_opening}. "
+                                                     f"Then your opponent said: {response}. Present your next argument.")
+            else:
+                response = await turn("pro_debater", f"Your opponent said: {response}. Present your next argument.")
+                response = await turn("con_debater", f"Your opponent said: {response}. Present your next argument.")
+            if on_round:
+                await on_round(round_num, debate)
 
         return debate
 
-    async def judge_debate(self, topic: str, debate_text: str) -> DebateEval:
-        # prompt adapted from InspireScore: https://github.com/fywang12/InspireDebate/blob/main/inspirescore.py
-
-        system_prompt = """
-        You are an experienced debate judge tasked with evaluating debates. For each debate, you will assess both sides based on four key criteria: Emotional Appeal, Clarity of Argument and Reasoning, Logical Arrangement of Arguments, and Relevance to Debate Topic.
-
-        For each of the four subdimensions, provide a score from 0 to 1 (with 0 being the lowest and 1 being the highest) for both the **Pro (Affirmative)** side and the **Con (Negative)** side. Additionally, provide a brief analysis for both sides for each subdimension.
-
-        Scoring Criteria:
-            1. **Emotional Appeal**
-                - How effectively does each side connect with the audience emotionally? Does the argument evoke empathy, passion, or values?
-                - **0**: No emotional appeal. The argument feels cold or disconnected.
-                - **1**: Highly engaging emotionally, strongly connects with the audience.
-
-            2. **Clarity of Argument and Reasoning**
-                - Are the arguments clearly presented? Is the reasoning sound and easy to follow?
-                - **0**: The arguments are unclear or confusing.
-                - **1**: The arguments are well-structured and easy to understand.
-
-            3. **Logical Arrangement of Arguments**
-                - Is the argument presented in a logical, coherent manner? Does each point flow into the next without confusion?
-                - **0**: The arguments are disorganized and difficult to follow.
-                - **1**: The arguments follow a clear and logical progression.
-
-            4. **Relevance to Debate Topic**
-                - Does each argument directly address the debate topic? Are there any irrelevant points or off-topic distractions?
-                - **0**: Arguments that stray far from the topic.
-                - **1**: Every argument is focused and relevant to the topic.
+    async def collect_round_evals(self, round_tasks: dict[int, asyncio.Task]) -> DebateEval:
+        """Waits for the per-round evaluations and aggregates them. Rounds whose judging failed are skipped."""
+        round_evals: dict[int, DebateEval] = {}
+        for round_num, task in round_tasks.items():
+            try:
+                round_evals[round_num] = await task
+            except Exception as e:
+                logger.warning(f"Judging round {round_num} failed: {e}")
+        if not round_evals:
+            raise RuntimeError("Judging failed for every round")
+        return aggregate_round_evals(round_evals)
+
+    async def judge_debate(self, topic: str, debate_text: str, panel: JudgePanel | None = None) -> DebateEval:
+        user_prompt = JUDGE_DEBATE_PROMPT.format(topic=topic, debate_text=debate_text)
+        return await self._verdict(topic, debate_text, user_prompt, panel)
+
+    async def judge_round(self, topic: str, debate_text: str, round_num: int,
+                          panel: JudgePanel | None = None) -> DebateEval:
+        """Scores the arguments of one round; earlier rounds are only given as context."""
+        user_prompt = JUDGE_ROUND_PROMPT.format(topic=topic, debate_text=debate_text, round_num=round_num)
+        return await self._verdict(topic, debate_text, user_prompt, panel, f"round {round_num}")
+
+    async def _verdict(self, topic: str, debate_text: str, user_prompt: str,
+                       panel: JudgePanel | None, *key_extra: str) -> DebateEval:
+        """Judges with the panel or a single judge.
+
+        A single judge reuses the cached verdict of an identical transcript. Panel
+        verdicts are sampled at PANEL_TEMPERATURE on purpose, so they are never cached.
+        """
+        if panel:
+            return await panel.evaluate(self._llm, JUDGE_SYSTEM_PROMPT, user_prompt)
+
+        key = None
+        if self._verdicts.enabled:
+            key = self._verdicts.key(JUDGE_MODEL, JUDGE_PROMPT_VERSION, topic, debate_text, *key_extra)
+            cached = self._verdicts.get(key)
+            if cached is not None:
+                logger.info(f"Verdict cache hit ({self._verdicts.stats()})")
+                return DebateEval.model_validate(cached["eval"])
+
+        verdict = await self._llm.generate_structured(
+            model=JUDGE_MODEL,
+            system=JUDGE_SYSTEM_PROMPT,
+            prompt=user_prompt,
+            schema=DebateEval,
+        )
+        if key:
+            self._verdicts.put(key, {"eval": verdict.model_dump()})
+        return verdict
 
-        Please output the result in the following format:
 
-        1. **Pro (Affirmative Side) Score**:
-            - Emotional Appeal: [score]
-            - Argument Clarity: [score]
-            - Argument Arrangement: [score]
-            - Relevance to Debate Topic: [score]
-            - **Total Score**: [total score]
+def forfeit_after(config: dict[str, Any]) -> int | None:
+    value = config.get("forfeit_after")
+    return int(value) if value is not None else None
 
-        2. **Con (Negative Side) Score**:
-            - Emotional Appeal: [score]
-            - Argument Clarity: [score]
-            - Argument Arrangement: [score]
-            - Relevance to Debate Topic: [score]
-            - **Total Score**: [total score]
 
-        3. **Winner**: [Pro/Con]
-        4. **Reason**: [Provide detailed analysis based on the scores]
-        """
+def is_tournament(request: EvalRequest) -> bool:
+    return request.config.get("mode") == "tournament"
 
-        user_prompt = f"""
-        Evaluate the debate on the topic: '{topic}'
-        Debate analysis process and arguments are as follows:
-        {debate_text}
-        Provide a JSON formatted response with scores and comments for each criterion for both debaters.
-        """
 
-        response = self._client.models.generate_content(
-            model="gemini-2.0-flash",
-            config=genai.types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    response_mime_type="application/json",
-                    response_schema=DebateEval,
-                ),
-            contents=user_prompt,
-        )
-        return response.parsed
+def format_debate(debate: dict[str, list[str]]) -> str:
+    debate_text = ""
+    for i, (pro, con) in enumerate(zip(debate["pro_debater"], debate["con_debater"]), start=1):
+        debate_text += f"Pro Argument {i}: {pro}\n"
+        debate_text += f"Con Argument {i}: {con}\n"
+    return debate_text
 
 
 async def main():
@@ -185,8 +571,13 @@ async def main():
     parser.add_argument("--port", type=int, default=9019, help="Port to bind the server")
     parser.add_argument("--card-url", type=str, help="External URL to provide in the agent card")
     parser.add_argument("--cloudflare-quick-tunnel", action="store_true", help="Use a Cloudflare quick tunnel. Requires cloudflared. This will override --card-url")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
+    parser.add_argument("--breaker-threshold", type=int, default=3, help="Consecutive failures after which a participant's circuit opens")
+    parser.add_argument("--breaker-cooldown", type=float, default=30.0, help="Seconds before a participant with an open circuit is tried again")
     args = parser.parse_args()
 
+    use_fake_llm(args.fake_llm)
+
     if args.cloudflare_quick_tunnel:
         from agentbeats.cloudflare import quick_tunnel
         agent_url_cm = quick_tunnel(f"http://{args.host}:{args.port}")
@@ -194,7 +585,7 @@ async def main():
         agent_url_cm = contextlib.nullcontext(args.card_url or f"http://{args.host}:{args.port}/")
 
     async with agent_url_cm as agent_url:
-        agent = DebateJudge()
+        agent = DebateJudge(HealthRegistry(failure_threshold=args.breaker_threshold, cooldown=args.breaker_cooldown))
         executor = GreenExecutor(agent)
         agent_card = debate_judge_agent_card("DebateJudge", agent_url)
 
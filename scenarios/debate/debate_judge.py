@@ -4,22 +4,138 @@ import asyncio
 import logging
 import os
 import json
+import time
 import uuid
 import httpx
+from collections import OrderedDict
 from dotenv import load_dotenv
-from typing import Dict, Any, List
-import litellm
+from typing import Dict, Any, List, Optional
 
 load_dotenv()
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from agentbeats.fake_llm import use_fake_llm
+from agentbeats.health import CircuitOpenError, HealthRegistry
+from agentbeats.llm import get_gateway
+from agentbeats.verdict_cache import VerdictCache, prompt_version
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("debate_judge")
 
 app = FastAPI()
 
+TERMINAL_STATES = {"completed", "failed", "canceled"}
+
+JUDGE_SYSTEM_PROMPT = "You are a debate judge. Evaluate the arguments and determine which side made stronger points. Consider logic, evidence, persuasiveness, and relevance to the topic."
+JUDGE_INSTRUCTIONS = "Please evaluate this debate and determine the winner. Return your evaluation as JSON with 'winner' (pro/con), 'reason', and 'scores' (pro and con scores from 0-1)."
+# Part of the verdict cache key, so editing a prompt invalidates cached verdicts
+JUDGE_PROMPT_VERSION = prompt_version(JUDGE_SYSTEM_PROMPT, JUDGE_INSTRUCTIONS)
+
+class RegistryFullError(Exception):
+    """Raised when the registry holds max_jobs unfinished assessments"""
+
+class AssessmentJob:
+    """A debate assessment running in the background"""
+    
+    def __init__(self, participants: Dict[str, str], config: Dict[str, Any]):
+        self.id = str(uuid.uuid4())
+        self.participants = participants
+        self.config = config
+        self.state = "submitted"
+        self.created = time.time()
+        self.updated = self.created
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+    
+    def set_state(self, state: str):
+        self.state = state
+        self.updated = time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "assessment_id": self.id,
+            "status": self.state,
+            "created": self.created,
+            "updated": self.updated,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+class AssessmentRegistry:
+    """Bounded registry of background assessments.
+    
+    At most max_concurrency assessments run at once, the rest wait in
+    "submitted" state. Finished assessments are kept for ttl seconds so
+    clients can fetch their results, and at most max_jobs are held in total.
+    """
+    
+    def __init__(self, max_jobs: int = 1000, ttl: float = 3600, max_concurrency: int = 8):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.max_concurrency = max_concurrency
+        self.jobs: "OrderedDict[str, AssessmentJob]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    def _evict(self):
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.state in TERMINAL_STATES and now - job.updated > self.ttl:
+                del self.jobs[job_id]
+        # Make room by dropping the oldest finished jobs
+        if len(self.jobs) >= self.max_jobs:
+            for job_id, job in list(self.jobs.items()):
+                if len(self.jobs) < self.max_jobs:
+                    break
+                if job.state in TERMINAL_STATES:
+                    del self.jobs[job_id]
+    
+    def submit(self, participants: Dict[str, str], config: Dict[str, Any], run) -> AssessmentJob:
+        """Start run(participants, config) in the background and return its job"""
+        self._evict()
+        if len(self.jobs) >= self.max_jobs:
+            raise RegistryFullError(f"Too many unfinished assessments ({self.max_jobs})")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        job = AssessmentJob(participants, config)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, run))
+        return job
+    
+    async def _run(self, job: AssessmentJob, run):
+        try:
+            async with self._semaphore:
+                job.set_state("working")
+                result = await run(job.participants, job.config)
+            if "error" in result:
+                job.error = result["error"]
+                job.set_state("failed")
+            else:
+                job.result = result
+                job.set_state("completed")
+        except asyncio.CancelledError:
+            job.set_state("canceled")
+        except Exception as e:
+            logger.error(f"Assessment {job.id} failed: {e}")
+            job.error = str(e)
+            job.set_state("failed")
+    
+    def get(self, job_id: str) -> Optional[AssessmentJob]:
+        self._evict()
+        return self.jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> Optional[AssessmentJob]:
+        job = self.jobs.get(job_id)
+        if job and job.task and job.state not in TERMINAL_STATES:
+            job.task.cancel()
+            job.set_state("canceled")
+        return job
+
 class DebateJudge:
     """Green agent that orchestrates debates between participants"""
     
@@ -31,9 +147,17 @@ class DebateJudge:
         else:
             self.use_mock = False
             logger.info(f"✅ Groq API key loaded")
+        self.model = os.getenv("DEBATE_JUDGE_MODEL", "groq/llama3-70b-8192")
+        self.llm = get_gateway()
+        
+        # Background assessments, fetched with tasks/get
+        self.assessments = AssessmentRegistry()
+        
+        # Verdicts of previously judged transcripts
+        self.verdicts = VerdictCache.from_env()
         
-        # Store ongoing assessments
-        self.assessments = {}
+        # Debater health shared across debates, so dead endpoints fail fast
+        self.health = HealthRegistry()
         
     async def evaluate_debate(self, pro_args: List[str], con_args: List[str], topic: str) -> Dict[str, Any]:
         """Evaluate debate arguments and determine winner"""
@@ -62,31 +186,42 @@ class DebateJudge:
                 arguments_text = f"Topic: {topic}\n\nPro arguments:\n" + "\n".join([f"- {arg}" for arg in pro_args])
                 arguments_text += f"\n\nCon arguments:\n" + "\n".join([f"- {arg}" for arg in con_args])
                 
+                # Identical transcripts get the cached verdict
+                cache_key = None
+                if self.verdicts.enabled:
+                    cache_key = self.verdicts.key(self.model, JUDGE_PROMPT_VERSION, topic, arguments_text)
+                    cached = self.verdicts.get(cache_key)
+                    if cached is not None:
+                        logger.info(f"Verdict cache hit ({self.verdicts.stats()})")
+                        return dict(cached)
+                
                 messages = [
                     {
                         "role": "system",
-                        "content": "You are a debate judge. Evaluate the arguments and determine which side made stronger points. Consider logic, evidence, persuasiveness, and relevance to the topic."
+                        "content": JUDGE_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
-                        "content": f"{arguments_text}\n\nPlease evaluate this debate and determine the winner. Return your evaluation as JSON with 'winner' (pro/con), 'reason', and 'scores' (pro and con scores from 0-1)."
+                        "content": f"{arguments_text}\n\n{JUDGE_INSTRUCTIONS}"
                     }
                 ]
                 
-                response = await litellm.acompletion(
-                    model="groq/llama3-70b-8192",
+                response = await self.llm.complete(
+                    model=self.model,
                     messages=messages,
                     api_key=self.groq_api_key,
                     temperature=0.3
                 )
                 
-                evaluation_text = response.choices[0].message.content
+                evaluation_text = response.text
                 # Parse JSON from response
                 try:
                     import re
                     json_match = re.search(r'\{.*\}', evaluation_text, re.DOTALL)
                     if json_match:
                         evaluation = json.loads(json_match.group())
+                        if cache_key:
+                            self.verdicts.put(cache_key, evaluation)
                         return evaluation
                     else:
                         raise ValueError("No JSON found in response")
@@ -106,8 +241,70 @@ class DebateJudge:
                     "scores": {"pro": 0.7, "con": 0.6}
                 }
     
+    async def evaluate_incrementally(self, round_evaluations: Dict[int, asyncio.Task]) -> Dict[str, Any]:
+        """Combine per-round evaluations by averaging their scores (no final LLM call)"""
+        evaluations = {}
+        for round_num, task in round_evaluations.items():
+            try:
+                evaluations[round_num] = await task
+            except Exception as e:
+                logger.error(f"Round {round_num} evaluation failed: {e}")
+        if not evaluations:
+            return {
+                "winner": "pro",
+                "reason": "Default evaluation - no round could be evaluated",
+                "scores": {"pro": 0.7, "con": 0.6}
+            }
+        
+        scores = {}
+        for side in ("pro", "con"):
+            side_scores = [float(e.get("scores", {}).get(side, 0)) for e in evaluations.values()]
+            scores[side] = round(sum(side_scores) / len(side_scores), 2)
+        if scores["pro"] != scores["con"]:
+            winner = "pro" if scores["pro"] > scores["con"] else "con"
+        else:
+            pro_wins = sum(e.get("winner") == "pro" for e in evaluations.values())
+            winner = "pro" if pro_wins * 2 >= len(evaluations) else "con"
+        
+        return {
+            "winner": winner,
+            "reason": "\n".join(f"Round {r}: {e.get('reason', '')}" for r, e in sorted(evaluations.items())),
+            "scores": scores,
+            "round_evaluations": {str(r): e for r, e in sorted(evaluations.items())}
+        }
+    
+    async def _request_argument(self, client: httpx.AsyncClient, url: str, topic: str,
+                                round_num: int, previous_argument: str) -> str | None:
+        """Ask a debater for its argument; returns None if it gave no result, raises on an HTTP error"""
+        response = await client.post(
+            url,
+            json={
+                "jsonrpc": "2.0",
+                "method": "message/send",
+                "params": {
+                    "topic": topic,
+                    "round": round_num,
+                    "previous_arguments": previous_argument
+                },
+                "id": str(uuid.uuid4())
+            }
+        )
+        # An error status counts as a failed turn for the debater's circuit breaker
+        response.raise_for_status()
+        data = response.json()
+        if "result" in data:
+            return data["result"].get("argument", "")
+        return None
+    
     async def orchestrate_debate(self, participants: Dict[str, str], config: Dict[str, Any]) -> Dict[str, Any]:
         """Orchestrate a debate between participants"""
+        with self.llm.assessment() as llm_usage:
+            result = await self._orchestrate_debate(participants, config)
+        if "error" not in result:
+            result["llm_usage"] = llm_usage.to_dict()
+        return result
+
+    async def _orchestrate_debate(self, participants: Dict[str, str], config: Dict[str, Any]) -> Dict[str, Any]:
         topic = config.get("topic", "Should artificial intelligence be regulated?")
         num_rounds = int(config.get("num_rounds", 2))
         
@@ -120,72 +317,100 @@ class DebateJudge:
         if not pro_url or not con_url:
             return {"error": "Missing participant URLs"}
         
+        turn_timeout = float(config.get("turn_timeout", 30.0))
+        round_pause = float(config.get("round_pause", 0))
+        # A side forfeits after this many failed turns, or at once if its circuit is open
+        forfeit_after = int(config["forfeit_after"]) if config.get("forfeit_after") is not None else None
+        failed_turns = {"pro": 0, "con": 0}
+        forfeit = None
+        # "simultaneous" requests both openings at once; con's opening then doesn't see pro's
+        simultaneous = config.get("opening_mode", "sequential") == "simultaneous"
+        # "incremental" scores each round in the background while the next one is argued
+        incremental = config.get("judging", "final") == "incremental"
+        
         pro_arguments = []
         con_arguments = []
+        round_evaluations: Dict[int, asyncio.Task] = {}
         
-        # Conduct debate rounds
-        for round_num in range(1, num_rounds + 1):
-            logger.info(f"=== Debate Round {round_num} ===")
-            
-            # Get pro argument
+        async def argue(side: str, client: httpx.AsyncClient, url: str, round_num: int, previous: str) -> Optional[Exception]:
+            """Request and record one argument; returns the error if the turn failed"""
+            arguments = pro_arguments if side == "pro" else con_arguments
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    pro_response = await client.post(
-                        pro_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "method": "message/send",
-                            "params": {
-                                "topic": topic,
-                                "round": round_num,
-                                "previous_arguments": con_arguments[-1] if con_arguments else ""
-                            },
-                            "id": str(uuid.uuid4())
-                        }
-                    )
-                    
-                    if pro_response.status_code == 200:
-                        pro_data = pro_response.json()
-                        if "result" in pro_data:
-                            pro_arg = pro_data["result"].get("argument", "")
-                            pro_arguments.append(pro_arg)
-                            logger.info(f"Pro argument: {pro_arg[:100]}...")
+                argument = await self.health.call(url, lambda: self._request_argument(
+                    client, url, topic, round_num, previous))
+                if argument is not None:
+                    arguments.append(argument)
+                    logger.info(f"{side.capitalize()} argument: {argument[:100]}...")
+                return None
             except Exception as e:
-                logger.error(f"Failed to get pro argument: {e}")
-                pro_arguments.append(f"Pro argument unavailable for round {round_num}")
-            
-            # Get con argument
-            try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    con_response = await client.post(
-                        con_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "method": "message/send",
-                            "params": {
-                                "topic": topic,
-                                "round": round_num,
-                                "previous_arguments": pro_arguments[-1] if pro_arguments else ""
-                            },
-                            "id": str(uuid.uuid4())
-                        }
-                    )
+                logger.error(f"Failed to get {side} argument: {e}")
+                arguments.append(f"{side.capitalize()} argument unavailable for round {round_num}")
+                failed_turns[side] += 1
+                return e
+        
+        pro_opening: Optional[str] = None  # set in simultaneous mode, where con's opening doesn't see it
+
+        def forfeits(side: str, error: Optional[Exception]) -> bool:
+            return bool(forfeit_after and error and (
+                isinstance(error, CircuitOpenError) or failed_turns[side] >= forfeit_after))
+        
+        try:
+            # One keep-alive connection per participant for the whole debate
+            limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+            async with httpx.AsyncClient(timeout=turn_timeout, limits=limits) as pro_client, \
+                    httpx.AsyncClient(timeout=turn_timeout, limits=limits) as con_client:
+                # Conduct debate rounds
+                for round_num in range(1, num_rounds + 1):
+                    logger.info(f"=== Debate Round {round_num} ===")
+                    round_start = (len(pro_arguments), len(con_arguments))
+                
+                    if simultaneous and round_num == 1:
+                        # Independent openings, requested concurrently
+                        pro_error, con_error = await asyncio.gather(
+                            argue("pro", pro_client, pro_url, round_num, ""),
+                            argue("con", con_client, con_url, round_num, ""))
+                        # Con has not seen it; it goes into con's first rebuttal
+                        pro_opening = pro_arguments[-1] if len(pro_arguments) > round_start[0] else None
+                    else:
+                        pro_error = await argue("pro", pro_client, pro_url, round_num,
+                                                con_arguments[-1] if con_arguments else "")
+                        con_error = None
+                        if not forfeits("pro", pro_error):
+                            previous = pro_arguments[-1] if pro_arguments else ""
+                            if round_num == 2 and pro_opening is not None:
+                                previous = f"Your opponent opened with: {pro_opening}\n\nThen your opponent said: {previous}"
+                            con_error = await argue("con", con_client, con_url, round_num, previous)
                     
-                    if con_response.status_code == 200:
-                        con_data = con_response.json()
-                        if "result" in con_data:
-                            con_arg = con_data["result"].get("argument", "")
-                            con_arguments.append(con_arg)
-                            logger.info(f"Con argument: {con_arg[:100]}...")
-            except Exception as e:
-                logger.error(f"Failed to get con argument: {e}")
-                con_arguments.append(f"Con argument unavailable for round {round_num}")
-            
-            # Brief pause between rounds
-            await asyncio.sleep(1)
+                    if forfeits("pro", pro_error):
+                        forfeit = ("pro", str(pro_error))
+                        break
+                    if forfeits("con", con_error):
+                        forfeit = ("con", str(con_error))
+                        break
+                
+                    if incremental:
+                        round_evaluations[round_num] = asyncio.create_task(self.evaluate_debate(
+                            pro_arguments[round_start[0]:], con_arguments[round_start[1]:], topic))
+                
+                    # Optional pacing between rounds
+                    if round_pause > 0 and round_num < num_rounds:
+                        await asyncio.sleep(round_pause)
         
-        # Evaluate the debate
-        evaluation = await self.evaluate_debate(pro_arguments, con_arguments, topic)
+            # Evaluate the debate
+            if forfeit:
+                side, last_error = forfeit
+                evaluation = {
+                    "winner": "con" if side == "pro" else "pro",
+                    "reason": f"{side.capitalize()} forfeited after {failed_turns[side]} failed turn(s), last error: {last_error}",
+                    "forfeit": side
+                }
+            elif incremental:
+                evaluation = await self.evaluate_incrementally(round_evaluations)
+            else:
+                evaluation = await self.evaluate_debate(pro_arguments, con_arguments, topic)
+        finally:
+            for task in round_evaluations.values():
+                task.cancel()
         
         result = {
             "topic": topic,
@@ -195,7 +420,8 @@ class DebateJudge:
                 "pro": pro_arguments,
                 "con": con_arguments
             },
-            "participants": participants
+            "participants": participants,
+            "participant_health": [self.health.get(pro_url).to_dict(), self.health.get(con_url).to_dict()]
         }
         
         logger.info(f"Debate completed. Winner: {evaluation.get('winner', 'unknown')}")
@@ -224,21 +450,45 @@ async def handle_jsonrpc(request: Request):
                     participants = params.get("participants", {})
                     config = params.get("config", {})
                     
-                    # Start debate orchestration
-                    # Note: In production, this should be async and report results via MCP/API
-                    result = await judge.orchestrate_debate(participants, config)
+                    # Run the debate in the background and reply immediately
+                    try:
+                        job = judge.assessments.submit(participants, config, judge.orchestrate_debate)
+                    except RegistryFullError as e:
+                        return JSONResponse({
+                            "jsonrpc": "2.0",
+                            "error": {"code": -32000, "message": str(e)},
+                            "id": jsonrpc_id
+                        })
                     
-                    # Return acknowledgment (actual results should be reported via MCP/API)
                     return JSONResponse({
                         "jsonrpc": "2.0",
                         "result": {
                             "status": "assessment_started",
-                            "message": "Debate assessment initiated. Results will be available shortly.",
-                            "assessment_id": str(uuid.uuid4())
+                            "message": "Debate assessment initiated. Fetch status and results with tasks/get.",
+                            "assessment_id": job.id
                         },
                         "id": jsonrpc_id
                     })
             
+            # Fetch or cancel a background assessment
+            if method in ("tasks/get", "tasks/cancel"):
+                job_id = (params.get("id") or params.get("assessment_id")) if isinstance(params, dict) else None
+                if method == "tasks/get":
+                    job = judge.assessments.get(job_id)
+                else:
+                    job = judge.assessments.cancel(job_id)
+                if not job:
+                    return JSONResponse({
+                        "jsonrpc": "2.0",
+                        "error": {"code": -32001, "message": f"Assessment '{job_id}' not found"},
+                        "id": jsonrpc_id
+                    })
+                return JSONResponse({
+                    "jsonrpc": "2.0",
+                    "result": job.to_dict(),
+                    "id": jsonrpc_id
+                })
+            
             # Method not found
             return JSONResponse({
                 "jsonrpc": "2.0",
@@ -320,14 +570,33 @@ async def root():
         "role": "green_agent",
         "description": "Orchestrates and evaluates debates between pro/con agents",
         "endpoint": "POST / (JSON-RPC 2.0)",
-        "methods": ["message/send"]
+        "methods": ["message/send", "tasks/get", "tasks/cancel"],
+        "verdict_cache": judge.verdicts.stats(),
+        "participant_health": judge.health.snapshot()
     }
 
 def main():
+    global judge
+
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--max-concurrent-assessments", type=int, default=8, help="Assessments run at the same time; others wait")
+    parser.add_argument("--max-assessments", type=int, default=1000, help="Unfinished plus retained assessments kept in memory")
+    parser.add_argument("--assessment-ttl", type=float, default=3600, help="Seconds finished assessment results are kept")
+    parser.add_argument("--breaker-threshold", type=int, default=3, help="Consecutive failures after which a debater's circuit opens")
+    parser.add_argument("--breaker-cooldown", type=float, default=30.0, help="Seconds before a debater with an open circuit is tried again")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
     args = parser.parse_args()
+
+    if use_fake_llm(args.fake_llm):
+        judge = DebateJudge()
+    judge.assessments = AssessmentRegistry(
+        max_jobs=args.max_assessments,
+        ttl=args.assessment_ttl,
+        max_concurrency=args.max_concurrent_assessments,
+    )
+    judge.health = HealthRegistry(failure_threshold=args.breaker_threshold, cooldown=args.breaker_cooldown)
     
     logger.info(f"🚀 Starting debate judge (green agent) on http://{args.host}:{args.port}")
     
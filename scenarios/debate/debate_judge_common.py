@@ -1,5 +1,6 @@
+import statistics
 from pydantic import BaseModel
-from typing import Literal
+from typing import Any, Literal
 
 from a2a.types import (
     AgentCapabilities,
@@ -22,6 +23,79 @@ class DebateEval(BaseModel):
     reason: str
 
 
+AGGREGATES = ("mean", "median", "trimmed_mean")
+
+
+def trimmed_mean(values: list[float], proportion: float = 0.1) -> float:
+    """Mean after dropping `proportion` of the values from each end (at least one each once there are 3+)."""
+    ordered = sorted(values)
+    k = int(len(ordered) * proportion)
+    if len(ordered) >= 3:
+        k = max(k, 1)
+    return statistics.mean(ordered[k:len(ordered) - k])
+
+
+def combine_scores(scores: list[DebaterScore], method: str = "mean") -> DebaterScore:
+    """Combines each dimension over a list of scores with `method` (one of AGGREGATES)."""
+    combine = {"mean": statistics.mean, "median": statistics.median, "trimmed_mean": trimmed_mean}[method]
+    return DebaterScore(**{
+        name: combine([getattr(s, name) for s in scores])
+        for name in DebaterScore.model_fields
+    })
+
+
+def pick_winner(pro: DebaterScore, con: DebaterScore, evals: list[DebateEval]) -> str:
+    """Higher combined total score wins; a majority of the individual verdicts breaks ties."""
+    if pro.total_score != con.total_score:
+        return "pro_debater" if pro.total_score > con.total_score else "con_debater"
+    pro_wins = sum(e.winner == "pro_debater" for e in evals)
+    return "pro_debater" if pro_wins * 2 >= len(evals) else "con_debater"
+
+
+def aggregate_panel(evals: list[DebateEval], method: str = "mean") -> tuple[DebateEval, dict[str, Any]]:
+    """Combines the verdicts of a judge panel, returning the verdict and agreement statistics.
+
+    Agreement statistics are the share of judges that picked the combined
+    winner and the standard deviation of each score dimension across judges.
+    """
+    if not evals:
+        raise ValueError("No judge evaluations to aggregate")
+    pro = combine_scores([e.pro_debater for e in evals], method)
+    con = combine_scores([e.con_debater for e in evals], method)
+    winner = pick_winner(pro, con, evals)
+    agreeing = [e for e in evals if e.winner == winner]
+    reason = (agreeing or evals)[0].reason
+    agreement = {
+        "judges": len(evals),
+        "aggregate": method,
+        "winner_agreement": round(len(agreeing) / len(evals), 3),
+        "score_stdev": {
+            side: {
+                name: round(statistics.pstdev([getattr(getattr(e, side), name) for e in evals]), 4)
+                for name in DebaterScore.model_fields
+            }
+            for side in ("pro_debater", "con_debater")
+        },
+    }
+    return DebateEval(pro_debater=pro, con_debater=con, winner=winner, reason=reason), agreement
+
+
+def aggregate_round_evals(round_evals: dict[int, DebateEval]) -> DebateEval:
+    """Combines evaluations keyed by round number into one verdict without another LLM call.
+
+    Scores are averaged per dimension; the winner has the higher mean total
+    score, with rounds won breaking ties.
+    """
+    if not round_evals:
+        raise ValueError("No round evaluations to aggregate")
+    evals = [round_evals[r] for r in sorted(round_evals)]
+    pro = combine_scores([e.pro_debater for e in evals])
+    con = combine_scores([e.con_debater for e in evals])
+    winner = pick_winner(pro, con, evals)
+    reason = "\n".join(f"Round {r}: {round_evals[r].reason}" for r in sorted(round_evals))
+    return DebateEval(pro_debater=pro, con_debater=con, winner=winner, reason=reason)
+
+
 def debate_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
     skill = AgentSkill(
         id='moderate_and_judge_debate',
@@ -11,13 +11,18 @@ from a2a.types import (
     AgentCard,
 )
 
+from agentbeats.fake_llm import use_fake_llm
+
 def main():
     parser = argparse.ArgumentParser(description="Run the A2A debater agent.")
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
     parser.add_argument("--port", type=int, default=9019, help="Port to bind the server")
     parser.add_argument("--card-url", type=str, help="External URL to provide in the agent card")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
     args = parser.parse_args()
 
+    use_fake_llm(args.fake_llm)
+
     root_agent = Agent(
         name="debater",
         model="gemini-2.0-flash",
@@ -0,0 +1,165 @@
+"""Round-robin debate tournaments.
+
+Every pair of debaters meets on every topic twice, once on each side. Matches
+run concurrently, but no debater plays more than `max_per_debater` matches at a
+time. Elo ratings are updated as each match finishes, and Bradley-Terry
+strengths are refit from all results so far.
+"""
+import asyncio
+import itertools
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+logger = logging.getLogger("debate_judge.tournament")
+
+INITIAL_ELO = 1500.0
+ELO_K = 32.0
+
+
+@dataclass
+class Match:
+    index: int
+    topic: str
+    pro: str
+    con: str
+    winner: str | None = None  # debater name
+    detail: dict[str, Any] | None = None
+    error: str | None = None
+    seconds: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "topic": self.topic,
+            "pro_debater": self.pro,
+            "con_debater": self.con,
+            "winner": self.winner,
+            "error": self.error,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+        }
+
+
+def schedule(debaters: list[str], topics: list[str]) -> list[Match]:
+    """All pairings on all topics, each played with both side assignments."""
+    matches = []
+    for topic in topics:
+        for a, b in itertools.combinations(debaters, 2):
+            matches.append(Match(len(matches), topic, pro=a, con=b))
+            matches.append(Match(len(matches), topic, pro=b, con=a))
+    return matches
+
+
+def bradley_terry(wins: dict[tuple[str, str], int], players: list[str], iterations: int = 100) -> dict[str, float]:
+    """Bradley-Terry strengths fit with the MM algorithm, normalized to a geometric mean of 1.
+
+    `wins[(a, b)]` counts wins of a over b. Every player gets a half win and a
+    half loss against a virtual average opponent so that unbeaten and winless
+    players keep finite strengths.
+    """
+    strength = {p: 1.0 for p in players}
+    for _ in range(iterations):
+        updated = {}
+        for p in players:
+            won = 0.5
+            denom = 1.0 / (strength[p] + 1.0)
+            for q in players:
+                if q == p:
+                    continue
+                games = wins.get((p, q), 0) + wins.get((q, p), 0)
+                won += wins.get((p, q), 0)
+                if games:
+                    denom += games / (strength[p] + strength[q])
+            updated[p] = won / denom
+        scale = math.exp(sum(math.log(s) for s in updated.values()) / len(updated))
+        strength = {p: s / scale for p, s in updated.items()}
+    return strength
+
+
+@dataclass
+class Standings:
+    debaters: list[str]
+    elo: dict[str, float] = field(default_factory=dict)
+    wins: dict[tuple[str, str], int] = field(default_factory=dict)
+    played: int = 0
+    failed: int = 0
+
+    def __post_init__(self):
+        for d in self.debaters:
+            self.elo.setdefault(d, INITIAL_ELO)
+
+    def record(self, match: Match) -> None:
+        if match.winner is None:
+            self.failed += 1
+            return
+        self.played += 1
+        loser = match.con if match.winner == match.pro else match.pro
+        self.wins[(match.winner, loser)] = self.wins.get((match.winner, loser), 0) + 1
+        expected = 1 / (1 + 10 ** ((self.elo[loser] - self.elo[match.winner]) / 400))
+        self.elo[match.winner] += ELO_K * (1 - expected)
+        self.elo[loser] -= ELO_K * (1 - expected)
+
+    def table(self) -> list[dict[str, Any]]:
+        strength = bradley_terry(self.wins, self.debaters)
+        rows = []
+        for d in self.debaters:
+            won = sum(n for (w, _), n in self.wins.items() if w == d)
+            lost = sum(n for (_, l), n in self.wins.items() if l == d)
+            rows.append({
+                "debater": d,
+                "elo": round(self.elo[d], 1),
+                "bradley_terry": round(strength[d], 4),
+                "wins": won,
+                "losses": lost,
+            })
+        rows.sort(key=lambda r: r["elo"], reverse=True)
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        return rows
+
+
+async def run_tournament(
+    matches: list[Match],
+    play: Callable[[Match], Awaitable[None]],
+    on_result: Callable[[Match], Awaitable[None]],
+    max_per_debater: int = 1,
+    max_concurrent: int | None = None,
+) -> None:
+    """Plays `matches`, starting any pending match whose debaters both have a free slot.
+
+    `play(match)` fills in the match outcome; `on_result(match)` is awaited
+    as each match finishes, in completion order.
+    """
+    pending = list(matches)
+    busy: dict[str, int] = {}
+    running: dict[asyncio.Task, Match] = {}
+
+    def startable(match: Match) -> bool:
+        return busy.get(match.pro, 0) < max_per_debater and busy.get(match.con, 0) < max_per_debater
+
+    try:
+        while pending or running:
+            for match in list(pending):
+                if max_concurrent and len(running) >= max_concurrent:
+                    break
+                if startable(match):
+                    pending.remove(match)
+                    busy[match.pro] = busy.get(match.pro, 0) + 1
+                    busy[match.con] = busy.get(match.con, 0) + 1
+                    running[asyncio.create_task(play(match))] = match
+            if not running:
+                raise ValueError(f"None of {len(pending)} pending matches can start "
+                                 f"with max_per_debater={max_per_debater}, max_concurrent={max_concurrent}")
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                match = running.pop(task)
+                busy[match.pro] -= 1
+                busy[match.con] -= 1
+                if task.exception() is not None and match.error is None:
+                    match.error = str(task.exception())
+                await on_result(match)
+    finally:
+        for task in running:
+            task.cancel()
@@ -17,14 +17,16 @@ from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.events import EventQueue
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import AgentCapabilities, AgentCard, AgentSkill
-from a2a.utils import new_agent_text_message
-from litellm import completion
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill, TaskState
+from a2a.utils import new_agent_text_message, new_task
 from loguru import logger
 
+from agentbeats.fake_llm import use_fake_llm
+from agentbeats.llm import get_gateway
 
-def prepare_agent_card(url: str) -> AgentCard:
+
+def prepare_agent_card(url: str, streaming: bool = False) -> AgentCard:
     """Create the agent card for the tau2 purple agent."""
     skill = AgentSkill(
         id="task_fulfillment",
@@ -40,7 +42,7 @@ def prepare_agent_card(url: str) -> AgentCard:
         version="1.0.0",
         default_input_modes=["text/plain"],
         default_output_modes=["text/plain"],
-        capabilities=AgentCapabilities(),
+        capabilities=AgentCapabilities(streaming=streaming),
         skills=[skill],
     )
 
@@ -72,12 +74,26 @@ Rules:
 - ALWAYS wrap your response in <json>...</json> tags
 """
 
+LLM_MODEL = "openai/gpt-4o"
+ERROR_RESPONSE = '<json>\n{"name": "respond", "arguments": {"content": "I encountered an error processing your request."}}\n</json>'
+
+# Minimum number of characters buffered before a streamed delta is sent.
+# A delta is always flushed as soon as it closes the <json> block.
+STREAM_CHUNK_CHARS = 32
+
 
 class Tau2AgentExecutor(AgentExecutor):
-    """Executor for the tau2 purple agent."""
+    """Executor for the tau2 purple agent.
 
-    def __init__(self):
+    With streaming enabled, LLM tokens are sent as working status updates while
+    the completion is generated, and the task completes with a message holding
+    the full response, so non-streaming clients see the same final output.
+    """
+
+    def __init__(self, streaming: bool = False):
         self.ctx_id_to_messages: dict[str, list[dict]] = {}
+        self.streaming = streaming
+        self.llm = get_gateway()
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         user_input = context.get_user_input()
@@ -92,26 +108,72 @@ class Tau2AgentExecutor(AgentExecutor):
         messages = self.ctx_id_to_messages[context.context_id]
         messages.append({"role": "user", "content": user_input})
 
-        # Call LLM
+        if self.streaming:
+            assistant_content = await self._stream_completion(context, event_queue, messages)
+        else:
+            assistant_content = await self._completion(messages)
+
+        # Add assistant response to history
+        messages.append({"role": "assistant", "content": assistant_content})
+
+        if not self.streaming:
+            # Send response back via A2A
+            await event_queue.enqueue_event(
+                new_agent_text_message(assistant_content, context_id=context.context_id)
+            )
+
+    async def _completion(self, messages: list[dict]) -> str:
         try:
-            response = completion(
+            response = await self.llm.complete(
                 messages=messages,
-                model="openai/gpt-4o",
+                model=LLM_MODEL,
                 temperature=0.0,
             )
-            assistant_content = response.choices[0].message.content
+            assistant_content = response.text
             logger.info(f"LLM response: {assistant_content[:200]}...")
         except Exception as e:
             logger.error(f"LLM error: {e}")
-            assistant_content = '<json>\n{"name": "respond", "arguments": {"content": "I encountered an error processing your request."}}\n</json>'
-
-        # Add assistant response to history
-        messages.append({"role": "assistant", "content": assistant_content})
+            assistant_content = ERROR_RESPONSE
+        return assistant_content
+
+    async def _stream_completion(self, context: RequestContext, event_queue: EventQueue, messages: list[dict]) -> str:
+        task = context.current_task
+        if not task:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+        chunks: list[str] = []
+        pending = ""
+        try:
+            async for delta in self.llm.stream(
+                messages=messages,
+                model=LLM_MODEL,
+                temperature=0.0,
+            ):
+                chunks.append(delta)
+                pending += delta
+                if len(pending) >= STREAM_CHUNK_CHARS or "</json>" in pending:
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(pending, context_id=task.context_id, task_id=task.id),
+                    )
+                    pending = ""
+            if pending:
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_text_message(pending, context_id=task.context_id, task_id=task.id),
+                )
+            assistant_content = "".join(chunks)
+            logger.info(f"LLM response: {assistant_content[:200]}...")
+        except Exception as e:
+            logger.error(f"LLM error: {e}")
+            assistant_content = ERROR_RESPONSE
 
-        # Send response back via A2A
-        await event_queue.enqueue_event(
-            new_agent_text_message(assistant_content, context_id=context.context_id)
+        await updater.complete(
+            new_agent_text_message(assistant_content, context_id=task.context_id, task_id=task.id)
         )
+        return assistant_content
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise NotImplementedError
@@ -122,13 +184,17 @@ def main():
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
     parser.add_argument("--port", type=int, default=9019, help="Port to bind the server")
     parser.add_argument("--card-url", type=str, help="External URL for the agent card")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
+    parser.add_argument("--streaming", action="store_true", help="Stream LLM tokens as task status updates")
     args = parser.parse_args()
 
+    use_fake_llm(args.fake_llm)
+
     logger.info("Starting tau2 agent...")
-    card = prepare_agent_card(args.card_url or f"http://{args.host}:{args.port}/")
+    card = prepare_agent_card(args.card_url or f"http://{args.host}:{args.port}/", streaming=args.streaming)
 
     request_handler = DefaultRequestHandler(
-        agent_executor=Tau2AgentExecutor(),
+        agent_executor=Tau2AgentExecutor(streaming=args.streaming),
         task_store=InMemoryTaskStore(),
     )
 
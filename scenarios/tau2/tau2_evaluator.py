@@ -11,10 +11,10 @@ import argparse
 import asyncio
 import json
 import logging
+import threading
 import time
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import gymnasium as gym
 import uvicorn
 from dotenv import load_dotenv
 
@@ -34,31 +34,44 @@ from a2a.types import (
 )
 from a2a.utils import new_agent_text_message
 
+from agentbeats.fake_llm import use_fake_llm
 from agentbeats.green_executor import GreenAgent, GreenExecutor
 from agentbeats.models import EvalRequest
 from agentbeats.tool_provider import ToolProvider
 
-from tau2.data_model.simulation import RewardInfo
-from tau2.environment.tool import Tool
-from tau2.gym import TAU_BENCH_ENV_ID, register_gym_agent
-from tau2.run import get_tasks
+# tau2 (with gymnasium and litellm) takes seconds to import, so it is loaded on
+# the first assessment rather than delaying the agent card and `--help`.
+if TYPE_CHECKING:
+    from tau2.environment.tool import Tool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("tau2_evaluator")
 
 RESPOND_ACTION_NAME = "respond"
 
-# Register tau-bench gym environments
-register_gym_agent()
+_tau2_loaded = False
+_tau2_lock = threading.Lock()
 
 
-def tools_to_str(tools: list[Tool]) -> str:
+def load_tau2() -> None:
+    """Imports tau2 and registers the tau-bench gym environments, once."""
+    global _tau2_loaded
+    with _tau2_lock:
+        if not _tau2_loaded:
+            from tau2.gym import register_gym_agent
+            register_gym_agent()
+            _tau2_loaded = True
+
+
+def tools_to_str(tools: list["Tool"]) -> str:
     """Convert tau-bench tools to JSON schema format."""
     return json.dumps([tool.openai_schema for tool in tools], indent=2)
 
 
 def get_task_ids(domain: str, task_ids: Optional[list[str]], num_tasks: Optional[int] = None) -> list[str]:
     """Get task IDs for the domain, optionally limited to num_tasks."""
+    from tau2.run import get_tasks
+
     task_set_name = domain
     task_split_name = "base"
     if task_ids is None:
@@ -107,6 +120,9 @@ class Tau2Evaluator(GreenAgent):
         # Get the purple agent URL
         agent_url = str(req.participants["agent"])
 
+        # Off the event loop, so status requests are served while tau2 loads
+        await asyncio.to_thread(load_tau2)
+
         # Get task IDs
         resolved_task_ids = get_task_ids(domain, task_ids, num_tasks)
         logger.info(f"Running {len(resolved_task_ids)} tasks for domain {domain}")
@@ -191,6 +207,9 @@ Task Results:
         user_llm_args: dict,
     ) -> float:
         """Run a single tau-bench task and return the reward."""
+        import gymnasium as gym
+        from tau2.data_model.simulation import RewardInfo
+        from tau2.gym import TAU_BENCH_ENV_ID
 
         env = gym.make(
             TAU_BENCH_ENV_ID,
@@ -339,8 +358,12 @@ async def main():
     parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
     parser.add_argument("--port", type=int, default=9009, help="Port to bind the server")
     parser.add_argument("--card-url", type=str, help="External URL for the agent card")
+    parser.add_argument("--fake-llm", type=str, help="Base URL of a fake LLM server to use instead of the real provider (or set AGENTBEATS_FAKE_LLM_URL)")
     args = parser.parse_args()
 
+    # The tau2 user simulator calls litellm with the configured user_llm
+    use_fake_llm(args.fake_llm)
+
     agent_url = args.card_url or f"http://{args.host}:{args.port}/"
 
     agent = Tau2Evaluator()
@@ -0,0 +1,260 @@
+"""Warm agent pool daemon.
+
+`agentbeats-run` starts every agent, runs one assessment and stops everything,
+so each run pays the agents' cold start (imports, model clients, environments).
+The pool daemon keeps agents running between submissions instead:
+
+    agentbeats-pool serve &                       # run from the repository root
+    agentbeats-pool run scenarios/debate/scenario.toml [output.json]
+    agentbeats-pool status
+    agentbeats-pool stop
+
+For each submitted scenario, an agent already running on the same endpoint with
+the same `cmd` is reused. Agents that crashed or whose `cmd` changed are
+restarted, and only then is the assessment run. Agents not used by a scenario
+stay warm for later submissions. Submissions are run one at a time.
+
+Clients talk to the daemon over a Unix socket with newline-delimited JSON:
+a request such as {"action": "run", "scenario": "/abs/path.toml"} is answered
+by {"event": "log", "text": ...} lines and a final {"event": "done", ...}.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from agentbeats.run_scenario import agent_endpoints, agent_env, parse_toml, probe_agents, stop_agents
+
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"agentbeats-pool-{os.getuid()}.sock")
+LINE_LIMIT = 16 * 1024 * 1024  # client output lines carry whole artifacts
+
+
+@dataclass
+class PooledAgent:
+    role: str
+    endpoint: str
+    cmd: str
+    proc: subprocess.Popen
+    log_path: Path
+    started: float
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def to_dict(self) -> dict:
+        return {
+            "role": self.role,
+            "endpoint": self.endpoint,
+            "cmd": self.cmd,
+            "pid": self.proc.pid,
+            "alive": self.alive,
+            "exit_code": self.proc.returncode,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "log": str(self.log_path),
+        }
+
+
+class AgentPool:
+
+    def __init__(self, log_dir: Path, env: dict[str, str], startup_timeout: float = 60):
+        self.log_dir = log_dir
+        self.env = env
+        self.startup_timeout = startup_timeout
+        self.agents: dict[str, PooledAgent] = {}  # by endpoint
+        self._lock = asyncio.Lock()
+
+    def _launch(self, role: str, endpoint: str, cmd: str) -> PooledAgent:
+        port = endpoint.rsplit(":", 1)[-1]
+        log_path = self.log_dir / f"{role}-{port}.log"
+        with open(log_path, "a") as log:
+            proc = subprocess.Popen(
+                shlex.split(cmd),
+                env=self.env,
+                stdout=log, stderr=subprocess.STDOUT,
+                text=True,
+                start_new_session=True,
+            )
+        return PooledAgent(role, endpoint, cmd, proc, log_path, time.time())
+
+    def ensure(self, cfg: dict) -> dict[str, str]:
+        """Makes every agent of `cfg` with a `cmd` run, returning what was done per role."""
+        cmds = {p["role"]: p["cmd"] for p in cfg["participants"] if p.get("cmd")}
+        if cfg["green_agent"].get("cmd"):
+            cmds["green_agent"] = cfg["green_agent"]["cmd"]
+
+        actions: dict[str, str] = {}
+        for role, endpoint in agent_endpoints(cfg):
+            cmd = cmds[role]
+            agent = self.agents.get(endpoint)
+            if agent and agent.alive and agent.cmd == cmd:
+                actions[role] = "reused"
+                continue
+            if agent:
+                actions[role] = "restarted (crashed)" if not agent.alive else "restarted (cmd changed)"
+                stop_agents([agent.proc])
+            else:
+                actions[role] = "started"
+            self.agents[endpoint] = self._launch(role, endpoint, cmd)
+        return actions
+
+    async def run(self, scenario_path: Path, output_path: Path | None, emit) -> bool:
+        """Runs one assessment on warm agents, passing progress lines to `emit`."""
+        async with self._lock:
+            cfg = parse_toml(str(scenario_path))
+            # Stopping a changed agent waits for it to exit; keep serving status meanwhile
+            for role, action in (await asyncio.to_thread(self.ensure, cfg)).items():
+                await emit(f"{role}: {action}")
+
+            procs = [self.agents[endpoint].proc for _, endpoint in agent_endpoints(cfg)]
+            for agent in await probe_agents(cfg, self.startup_timeout, procs):
+                await emit(f"{agent.role}: {agent.describe()}")
+                if agent.ready_after is None:
+                    await emit(f"see {self.agents[agent.endpoint].log_path}")
+                    return False
+
+            client_args = [sys.executable, "-m", "agentbeats.client_cli", str(scenario_path)]
+            if output_path:
+                client_args.append(str(output_path))
+            client = await asyncio.create_subprocess_exec(
+                *client_args, env=self.env, limit=LINE_LIMIT,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+            )
+            try:
+                async for line in client.stdout:
+                    await emit(line.decode(errors="replace").rstrip("\n"))
+                return await client.wait() == 0
+            finally:
+                # A cancelled run or a failing `emit` must not leave the client running
+                if client.returncode is None:
+                    client.kill()
+                    await client.wait()
+
+    def status(self) -> list[dict]:
+        return [agent.to_dict() for agent in self.agents.values()]
+
+    def stop(self) -> None:
+        stop_agents([agent.proc for agent in self.agents.values()])
+        self.agents.clear()
+
+
+async def serve(socket_path: str, pool: AgentPool) -> None:
+    stopped = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def send(obj: dict):
+            writer.write((json.dumps(obj) + "\n").encode())
+            await writer.drain()
+
+        async def emit(text: str):
+            await send({"event": "log", "text": text})
+
+        try:
+            request = json.loads(await reader.readline())
+            action = request.get("action")
+            if action == "run":
+                start = time.monotonic()
+                output = request.get("output")
+                ok = await pool.run(Path(request["scenario"]), Path(output) if output else None, emit)
+                await send({"event": "done", "ok": ok, "seconds": round(time.monotonic() - start, 3)})
+            elif action == "status":
+                await send({"event": "done", "ok": True, "agents": pool.status()})
+            elif action == "stop":
+                await send({"event": "done", "ok": True})
+                stopped.set()
+            else:
+                await send({"event": "done", "ok": False, "error": f"Unknown action {action!r}"})
+        except Exception as e:
+            try:
+                await send({"event": "done", "ok": False, "error": str(e)})
+            except Exception:
+                pass
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(handle, path=socket_path, limit=LINE_LIMIT)
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        asyncio.get_running_loop().add_signal_handler(sig, stopped.set)
+    print(f"Agent pool listening on {socket_path}, agent logs in {pool.log_dir}")
+    try:
+        async with server:
+            await stopped.wait()
+    finally:
+        pool.stop()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+async def request(socket_path: str, payload: dict) -> dict:
+    """Sends one request to the daemon, printing its log lines, and returns the final message."""
+    reader, writer = await asyncio.open_unix_connection(socket_path, limit=LINE_LIMIT)
+    writer.write((json.dumps(payload) + "\n").encode())
+    await writer.drain()
+    final = {"ok": False, "error": "connection closed"}
+    async for line in reader:
+        message = json.loads(line)
+        if message.get("event") == "log":
+            print(message["text"])
+        else:
+            final = message
+    writer.close()
+    return final
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep scenario agents warm between assessments")
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET, help="Unix socket of the daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Run the daemon")
+    serve_parser.add_argument("--log-dir", type=str, help="Directory for agent logs (default: a temporary directory)")
+    serve_parser.add_argument("--startup-timeout", type=float, default=60)
+    run_parser = sub.add_parser("run", help="Run a scenario on the daemon's agents")
+    run_parser.add_argument("scenario", help="Path to scenario TOML file")
+    run_parser.add_argument("output", nargs="?", help="Optional path for the results JSON")
+    sub.add_parser("status", help="List the daemon's agents")
+    sub.add_parser("stop", help="Stop the daemon and its agents")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        log_dir = Path(args.log_dir or tempfile.mkdtemp(prefix="agentbeats-pool-"))
+        log_dir.mkdir(parents=True, exist_ok=True)
+        asyncio.run(serve(args.socket, AgentPool(log_dir, agent_env(), args.startup_timeout)))
+        return
+
+    if args.command == "run":
+        payload = {"action": "run", "scenario": str(Path(args.scenario).resolve())}
+        if args.output:
+            payload["output"] = str(Path(args.output).resolve())
+    else:
+        payload = {"action": args.command}
+    try:
+        result = asyncio.run(request(args.socket, payload))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No agent pool running at {args.socket}; start one with `agentbeats-pool serve`")
+        sys.exit(1)
+
+    if "agents" in result:
+        for agent in result["agents"]:
+            state = "alive" if agent["alive"] else f"exited ({agent['exit_code']})"
+            print(f"{agent['role']:20s} {agent['endpoint']:28s} pid {agent['pid']:<8} {state:12s} up {agent['uptime_seconds']}s")
+    elif "seconds" in result:
+        print(f"Finished in {result['seconds']}s")
+    if not result.get("ok"):
+        if result.get("error"):
+            print(f"Error: {result['error']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,16 +10,25 @@ from a2a.client import (
     ClientFactory,
     Consumer,
 )
+from a2a.client.errors import A2AClientHTTPError, A2AClientJSONRPCError, A2AClientTimeoutError
 from a2a.types import (
     Message,
     Part,
     Role,
+    Task,
+    TaskIdParams,
+    TaskQueryParams,
+    TaskState,
+    TaskStatusUpdateEvent,
     TextPart,
     DataPart,
 )
 
 
 DEFAULT_TIMEOUT = 300
+ACTIVE_STATES = (TaskState.submitted, TaskState.working)
+# Errors after which the agent may still be running the task
+CONNECTION_ERRORS = (A2AClientHTTPError, A2AClientTimeoutError, httpx.TransportError)
 
 
 def create_message(*, role: Role = Role.user, text: str, context_id: str | None = None) -> Message:
@@ -40,9 +49,10 @@ def merge_parts(parts: list[Part]) -> str:
             chunks.append(json.dumps(part.root.data, indent=2))
     return "\n".join(chunks)
 
-async def send_message(message: str, base_url: str, context_id: str | None = None, streaming=False, consumer: Consumer | None = None):
+async def send_message(message: str, base_url: str, context_id: str | None = None, streaming=False, consumer: Consumer | None = None,
+                       timeout: float = DEFAULT_TIMEOUT):
     """Returns dict with context_id, response and status (if exists)"""
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
+    async with httpx.AsyncClient(timeout=timeout) as httpx_client:
         resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
         agent_card = await resolver.get_agent_card()
         config = ClientConfig(
@@ -84,3 +94,59 @@ async def send_message(message: str, base_url: str, context_id: str | None = Non
                 pass
 
         return outputs
+
+
+async def follow_task(task_id: str, base_url: str, consumer: Consumer, *, backoff: float = 1.0, max_backoff: float = 30.0,
+                      max_retries: int | None = 8, timeout: float = DEFAULT_TIMEOUT, on_retry=None) -> Task:
+    """Follows a running task until it leaves the submitted and working states, and returns it.
+
+    Resubscribes to the task's event stream when the agent supports streaming,
+    and polls tasks/get otherwise or once the stream ends, backing off from
+    `backoff` to `max_backoff` seconds. Connection errors are retried with the
+    same backoff, up to `max_retries` consecutive times; `on_retry(error, delay)`
+    is called before each retry. Updates are passed to `consumer` as they
+    arrive, and the final task, with all its artifacts, as (task, None).
+    Raises A2AClientJSONRPCError if the agent does not know the task.
+    """
+    delay = backoff
+    failures = 0
+    while True:
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as httpx_client:
+                card = await A2ACardResolver(httpx_client=httpx_client, base_url=base_url).get_agent_card()
+                client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=True)).create(card)
+                task = await client.get_task(TaskQueryParams(id=task_id))
+                failures, delay = 0, backoff
+                if task.status.state in ACTIVE_STATES:
+                    await consumer((task, None), card)
+                if task.status.state in ACTIVE_STATES and card.capabilities.streaming:
+                    try:
+                        # The resubscribed stream only carries new events; the final
+                        # task is fetched below so that it includes earlier artifacts.
+                        async for event in client.resubscribe(TaskIdParams(id=task_id)):
+                            _, update = event
+                            if isinstance(update, TaskStatusUpdateEvent) and update.status.state not in ACTIVE_STATES:
+                                break
+                            await consumer(event, card)
+                    except A2AClientJSONRPCError:
+                        pass  # finished since the get, or no longer streaming
+                    task = await client.get_task(TaskQueryParams(id=task_id))
+
+                status = task.status
+                while task.status.state in ACTIVE_STATES:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, max_backoff)
+                    task = await client.get_task(TaskQueryParams(id=task_id))
+                    if task.status != status and task.status.state in ACTIVE_STATES:
+                        status = task.status
+                        await consumer((task, None), card)
+                await consumer((task, None), card)
+                return task
+        except CONNECTION_ERRORS as e:
+            failures += 1
+            if max_retries is not None and failures > max_retries:
+                raise
+            if on_retry:
+                on_retry(e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_backoff)
@@ -1,24 +1,25 @@
+import os
 import sys
 import json
+import argparse
+import time
 import asyncio
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 import tomllib
 
-from agentbeats.client import send_message
-from agentbeats.models import EvalRequest
-from a2a.types import (
-    AgentCard,
-    Message,
-    TaskStatusUpdateEvent,
-    TaskArtifactUpdateEvent,
-    Artifact,
-    TextPart,
-    DataPart,
-)
+# a2a and pydantic models are imported where used, which keeps importing this
+# module (e.g. from agentbeats-run before its agents are up) cheap.
+if TYPE_CHECKING:
+    from a2a.types import Artifact
+    from agentbeats.models import EvalRequest
 
 
-def parse_toml(d: dict[str, object]) -> tuple[EvalRequest, str, dict[str, str]]:
+def parse_toml(d: dict[str, object]) -> tuple["EvalRequest", str, dict[str, str]]:
+    from agentbeats.models import EvalRequest
+
     green = d.get("green_agent")
     if not isinstance(green, dict) or "endpoint" not in green:
         raise ValueError("green.endpoint is required in TOML")
@@ -43,23 +44,37 @@ def parse_toml(d: dict[str, object]) -> tuple[EvalRequest, str, dict[str, str]]:
     )
     return eval_req, green_endpoint, role_to_id
 
-def parse_parts(parts) -> tuple[list, list]:
+def parse_parts(parts, legacy_json: bool = False) -> tuple[list, list]:
+    """Splits parts into texts and data.
+
+    With `legacy_json`, JSON text is also taken as data: green agents that
+    predate DataParts send their `Result` artifact that way.
+    """
+    from a2a.types import DataPart, TextPart
+
     text_parts = []
     data_parts = []
 
     for part in parts:
-        if isinstance(part.root, TextPart):
-            try:
-                data_item = json.loads(part.root.text)
-                data_parts.append(data_item)
-            except Exception:
-                text_parts.append(part.root.text.strip())
-        elif isinstance(part.root, DataPart):
+        if isinstance(part.root, DataPart):
             data_parts.append(part.root.data)
+        elif isinstance(part.root, TextPart):
+            text = part.root.text.strip()
+            if legacy_json and text[:1] in ("{", "["):
+                try:
+                    data_parts.append(json.loads(text))
+                    continue
+                except ValueError:
+                    pass
+            text_parts.append(text)
 
     return text_parts, data_parts
 
-def print_parts(parts, task_state: str | None = None):
+def result_parts(artifact: "Artifact") -> list:
+    """The data of a result artifact."""
+    return parse_parts(artifact.parts, legacy_json=artifact.name == "Result")[1]
+
+def format_parts(parts, task_state: str | None = None) -> str:
     text_parts, data_parts = parse_parts(parts)
 
     output = []
@@ -70,79 +85,233 @@ def print_parts(parts, task_state: str | None = None):
     if data_parts:
         output.extend(json.dumps(item, indent=2) for item in data_parts)
 
-    print("\n".join(output) + "\n")
+    return "\n".join(output) + "\n"
 
-async def main():
-    if len(sys.argv) < 2:
-        print("Usage: python client_cli.py <scenario.toml> [output.json]")
-        sys.exit(1)
+def print_parts(parts, task_state: str | None = None):
+    print(format_parts(parts, task_state))
 
-    scenario_path = Path(sys.argv[1])
-    output_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
 
-    if not scenario_path.exists():
-        print(f"File not found: {scenario_path}")
-        sys.exit(1)
+class ResultsWriter:
+    """Appends result records to a JSONL file as they arrive.
+
+    Every record is flushed when written and fsynced at most every
+    `fsync_interval` seconds, and again on close, so the results received so
+    far survive an interrupted assessment.
+    """
+
+    def __init__(self, path: Path, fsync_interval: float = 1.0):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.records = 0
+        self._file = open(path, "w")
+        self._synced = time.monotonic()
 
-    toml_data = scenario_path.read_text()
-    data = tomllib.loads(toml_data)
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self.records += 1
+        if time.monotonic() - self._synced >= self.fsync_interval:
+            self.sync()
 
+    def sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+class AssessmentError(Exception):
+    """Raised when the green agent ends the assessment in a state other than completed."""
+
+    def __init__(self, state: str, message: str = ""):
+        super().__init__(f"Agent returned status {state}" + (f": {message}" if message else ""))
+        self.state = state
+
+
+@dataclass
+class AssessmentResult:
+    artifacts: list["Artifact"]
+    participants: dict[str, str]  # role -> agentbeats_id
+
+    def results(self) -> list:
+        all_data_parts = []
+        for artifact in self.artifacts:
+            all_data_parts.extend(result_parts(artifact))
+        return all_data_parts
+
+    def to_dict(self) -> dict:
+        return {
+            "participants": self.participants,
+            "results": self.results(),
+        }
+
+    def write(self, output_path: Path) -> None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+async def run_assessment(scenario: str | Path | dict, output_path: Path | None = None,
+                         echo: Callable[[str], None] | None = print, attach: str | None = None,
+                         max_reconnects: int | None = 8) -> AssessmentResult:
+    """Sends the assessment request of a scenario to its green agent and collects the artifacts.
+
+    `scenario` is a scenario TOML path or its parsed content. Streamed updates
+    are passed to `echo` (None silences them). Raises AssessmentError if the
+    green agent fails or rejects the assessment.
+
+    If `output_path` ends in `.jsonl`, results are streamed to it as they
+    arrive: a "start" record with the participants, one "result" record per
+    data part of each artifact update, and a final "summary" record. Otherwise
+    one JSON document is written once the assessment completes.
+
+    If the connection to the green agent drops after it has created the
+    assessment task, the task is followed by id until it finishes (see
+    `follow_task`), retrying up to `max_reconnects` consecutive connection
+    failures. With `attach`, no request is sent and the task with that id,
+    e.g. one started by another client, is followed instead.
+    """
+    from a2a.client.errors import A2AClientJSONRPCError
+    from a2a.types import AgentCard, Message, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+    from agentbeats.client import CONNECTION_ERRORS, follow_task, merge_parts, send_message
+
+    data = scenario if isinstance(scenario, dict) else tomllib.loads(Path(scenario).read_text())
     req, green_url, role_to_id = parse_toml(data)
 
-    artifacts: list[Artifact] = []
+    artifacts: list["Artifact"] = []
+    show = echo or (lambda _: None)
+    writer = ResultsWriter(output_path) if output_path and output_path.suffix == ".jsonl" else None
+    streamed: set[str] = set()  # artifact ids already written
+    start = time.monotonic()
+    task_id = attach
+    finished = False  # the task has left the submitted and working states
+    failure: AssessmentError | None = None
+
+    def write_artifact(artifact: "Artifact"):
+        streamed.add(artifact.artifact_id)
+        for item in result_parts(artifact):
+            writer.write({"type": "result", "artifact_id": artifact.artifact_id, "name": artifact.name, "data": item})
+
+    def on_task(task, state: str, parts):
+        nonlocal artifacts, task_id, finished, failure
+        if task_id is None:
+            task_id = task.id
+            show(f"Assessment task {task_id} (follow it from elsewhere with --attach {task_id})")
+        show(format_parts(parts, state))
+        finished = state not in ["submitted", "working"]
+        if state == "completed":
+            show(str(task.artifacts))
+            artifacts = task.artifacts or []
+            if writer:
+                for artifact in artifacts:
+                    if artifact.artifact_id not in streamed:
+                        write_artifact(artifact)
+        elif state not in ["submitted", "working"] and failure is None:
+            # Raised once the stream has ended; raising inside the SDK's stream
+            # would leave its HTTP generators to be closed at interpreter exit
+            failure = AssessmentError(state, merge_parts(parts).strip())
 
     async def event_consumer(event, card: AgentCard):
-        nonlocal artifacts
         match event:
             case Message() as msg:
-                print_parts(msg.parts)
+                show(format_parts(msg.parts))
 
             case (task, TaskStatusUpdateEvent() as status_event):
                 status = status_event.status
-                parts = status.message.parts if status.message else []
-                print_parts(parts, status.state.value)
-                if status.state.value == "completed":
-                    print(task.artifacts)
-                    artifacts = task.artifacts
-                elif status.state.value not in ["submitted", "working"]:
-                    print(f"Agent returned status {status.state.value}. Exiting.")
-                    exit(1)
+                on_task(task, status.state.value, status.message.parts if status.message else [])
 
             case (task, TaskArtifactUpdateEvent() as artifact_event):
-                print_parts(artifact_event.artifact.parts, "Artifact update")
+                show(format_parts(artifact_event.artifact.parts, "Artifact update"))
+                if writer:
+                    write_artifact(artifact_event.artifact)
 
             case task, None:
                 status = task.status
-                parts = status.message.parts if status.message else []
-                print_parts(parts, task.status.state.value)
-                if status.state.value == "completed":
-                    print(task.artifacts)
-                    artifacts = task.artifacts
-                elif status.state.value not in ["submitted", "working"]:
-                    print(f"Agent returned status {status.state.value}. Exiting.")
-                    exit(1)
+                on_task(task, status.state.value, status.message.parts if status.message else [])
 
             case _:
-                print("Unhandled event")
+                show("Unhandled event")
+
+    def on_retry(error: Exception, delay: float):
+        show(f"Connection to {green_url} failed ({error}), retrying in {delay:.0f}s")
 
     msg = req.model_dump_json()
-    await send_message(msg, green_url, streaming=True, consumer=event_consumer)
+    summary = {"type": "summary", "state": "completed"}
+    try:
+        if writer:
+            writer.write({"type": "start", "participants": role_to_id, "config": req.config, "task_id": attach})
+        if not attach:
+            try:
+                await send_message(msg, green_url, streaming=True, consumer=event_consumer)
+            except CONNECTION_ERRORS as e:
+                if task_id is None:
+                    raise
+                show(f"Lost the connection to {green_url} ({e}), following task {task_id}")
+        if task_id and not finished:
+            await follow_task(task_id, green_url, event_consumer, max_retries=max_reconnects, on_retry=on_retry)
+        if failure:
+            raise failure
+    except A2AClientJSONRPCError as e:
+        state = "rejected" if task_id is None else "lost"
+        summary.update(state=state, error=e.error.message)
+        raise AssessmentError(state, e.error.message) from e
+    except AssessmentError as e:
+        summary.update(state=e.state, error=str(e))
+        raise
+    except BaseException as e:
+        summary.update(state="interrupted", error=repr(e))
+        raise
+    finally:
+        if writer:
+            writer.write({**summary, "results": writer.records - 1, "seconds": round(time.monotonic() - start, 3)})
+            writer.close()
 
+    result = AssessmentResult(artifacts, role_to_id)
+    if output_path and not writer:
+        result.write(output_path)
     if output_path:
-        all_data_parts = []
-        for artifact in artifacts:
-            _, data_parts = parse_parts(artifact.parts)
-            all_data_parts.extend(data_parts)
+        show(f"Results written to {output_path}")
+    return result
 
-        output_data = {
-            "participants": role_to_id,
-            "results": all_data_parts
-        }
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            json.dump(output_data, f, indent=2)
-            print(f"Results written to {output_path}")
+async def run_client(scenario_path: Path, output_path: Path | None = None, concurrency: int | None = None,
+                     attach: str | None = None, max_reconnects: int | None = 8) -> bool:
+    """Runs the scenario's assessment, or every assessment of its `[sweep]`, returning whether it succeeded."""
+    data = tomllib.loads(Path(scenario_path).read_text())
+    if "sweep" in data and not attach:
+        from agentbeats.sweep import run_sweep
+
+        report = await run_sweep(data, output_path, concurrency)
+        return report["overall"]["completed"]["count"] > 0
+    try:
+        await run_assessment(data, output_path, attach=attach, max_reconnects=max_reconnects)
+    except AssessmentError as e:
+        print(f"{e}. Exiting.")
+        return False
+    return True
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Start an assessment on a scenario's green agent")
+    parser.add_argument("scenario", type=Path, help="Path to scenario TOML file")
+    parser.add_argument("output", type=Path, nargs="?", help="Optional results path (.jsonl to stream results)")
+    parser.add_argument("--concurrency", type=int, help="Assessments in flight for a [sweep] (overrides sweep.concurrency)")
+    parser.add_argument("--attach", type=str, metavar="TASK_ID",
+                        help="Follow an assessment task already running on the green agent instead of starting one")
+    parser.add_argument("--max-reconnects", type=int, default=8,
+                        help="Consecutive failed reconnects to the green agent before giving up")
+    args = parser.parse_args()
+
+    if not args.scenario.exists():
+        print(f"File not found: {args.scenario}")
+        sys.exit(1)
+
+    if not await run_client(args.scenario, args.output, args.concurrency, args.attach, args.max_reconnects):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,417 @@
+"""Local stand-in for the OpenAI/Groq and Gemini HTTP APIs.
+
+Serves scripted completions with configurable latency and error injection so
+that scenarios can be run and load-tested without a live LLM provider:
+
+    agentbeats-fake-llm --port 8765 --script fake_llm.toml
+
+Agents are pointed at the server with `--fake-llm http://127.0.0.1:8765` or by
+exporting AGENTBEATS_FAKE_LLM_URL (see `use_fake_llm`).
+
+Example script (every section is optional):
+
+    [latency]
+    ttft = { dist = "lognormal", median = 0.3, sigma = 0.4 }   # seconds
+    tokens_per_sec = 60
+
+    [errors]
+    rate = 0.02               # fraction of requests answered with an error
+    status = [429, 500, 503]
+    hang_rate = 0.0           # fraction of requests that hang for hang_seconds
+    hang_seconds = 60
+
+    [[responses]]
+    match = "debate judge"    # regex searched in the prompt text
+    model = "groq/*"          # optional glob on the requested model
+    texts = ['{"winner": "pro", "reason": "stub", "scores": {"pro": 0.8, "con": 0.6}}']
+"""
+import argparse
+import asyncio
+import fnmatch
+import itertools
+import json
+import math
+import os
+import random
+import re
+import time
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+
+FAKE_LLM_ENV = "AGENTBEATS_FAKE_LLM_URL"
+FAKE_API_KEY = "fake-llm"
+
+
+def use_fake_llm(url: str | None = None) -> str | None:
+    """Point litellm and google-genai clients of this process at a fake LLM server.
+
+    Falls back to $AGENTBEATS_FAKE_LLM_URL when `url` is not given and does
+    nothing if neither is set. Must be called before any LLM client is created.
+    Real API keys are replaced so they are never sent to the fake server.
+    Returns the base URL in use, or None.
+    """
+    url = url or os.getenv(FAKE_LLM_ENV)
+    if not url:
+        return None
+    url = url.rstrip("/")
+    os.environ[FAKE_LLM_ENV] = url
+    # litellm: openai/* and groq/* models
+    os.environ["OPENAI_API_BASE"] = f"{url}/v1"
+    os.environ["OPENAI_BASE_URL"] = f"{url}/v1"
+    os.environ["GROQ_API_BASE"] = f"{url}/openai/v1"
+    # google-genai (also used by google-adk)
+    os.environ["GOOGLE_GEMINI_BASE_URL"] = url
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+    os.environ.pop("GEMINI_API_KEY", None)
+    for key in ("OPENAI_API_KEY", "GROQ_API_KEY", "GOOGLE_API_KEY"):
+        os.environ[key] = FAKE_API_KEY
+    return url
+
+
+@dataclass
+class LatencyModel:
+    dist: str = "fixed"
+    params: dict[str, float] = field(default_factory=lambda: {"value": 0.0})
+    tokens_per_sec: float = 0.0  # 0 means no per-token delay
+
+    def ttft(self) -> float:
+        p = self.params
+        match self.dist:
+            case "fixed":
+                value = p.get("value", 0.0)
+            case "uniform":
+                value = random.uniform(p.get("low", 0.0), p.get("high", 0.0))
+            case "normal":
+                value = random.gauss(p.get("mean", 0.0), p.get("stddev", 0.0))
+            case "lognormal":
+                value = random.lognormvariate(math.log(p.get("median", 1.0)), p.get("sigma", 0.0))
+            case "exponential":
+                mean = p.get("mean", 0.0)
+                value = random.expovariate(1 / mean) if mean > 0 else 0.0
+            case _:
+                raise ValueError(f"Unknown latency distribution: {self.dist}")
+        return max(0.0, value)
+
+    def token_delay(self) -> float:
+        return 1 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+
+@dataclass
+class ErrorInjection:
+    rate: float = 0.0
+    status: list[int] = field(default_factory=lambda: [500])
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+
+
+@dataclass
+class ResponseRule:
+    texts: list[str]
+    match: re.Pattern | None = None
+    model: str | None = None
+    _cycle: Any = field(default=None, repr=False)
+
+    def matches(self, model: str, prompt: str) -> bool:
+        if self.model and not fnmatch.fnmatch(model, self.model):
+            return False
+        return not self.match or bool(self.match.search(prompt))
+
+    def next_text(self) -> str:
+        if self._cycle is None:
+            self._cycle = itertools.cycle(self.texts)
+        return next(self._cycle)
+
+
+DEFAULT_RULES = [
+    # tau2 purple agent: answer with a "respond" action
+    ResponseRule(
+        match=re.compile(r"<json>"),
+        texts=['<json>\n{"name": "respond", "arguments": {"content": "Thank you, could you share your user id?"}}\n</json>'],
+    ),
+    # tau2 user simulator: end the conversation
+    ResponseRule(match=re.compile(r"###STOP###"), texts=["###STOP###"]),
+    # FastAPI debate judge
+    ResponseRule(
+        match=re.compile(r"debate judge", re.IGNORECASE),
+        texts=['{"winner": "pro", "reason": "Stub verdict from the fake LLM server.", "scores": {"pro": 0.8, "con": 0.6}}'],
+    ),
+]
+DEFAULT_TEXT = "This is a stub response from the fake LLM server."
+
+
+@dataclass
+class FakeLLMScript:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    errors: ErrorInjection = field(default_factory=ErrorInjection)
+    rules: list[ResponseRule] = field(default_factory=lambda: list(DEFAULT_RULES))
+    default_text: str = DEFAULT_TEXT
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "FakeLLMScript":
+        latency = d.get("latency", {})
+        ttft = latency.get("ttft", 0.0)
+        if isinstance(ttft, dict):
+            ttft = dict(ttft)
+            dist = ttft.pop("dist", "fixed")
+        else:
+            dist, ttft = "fixed", {"value": float(ttft)}
+        errors = d.get("errors", {})
+        rules = [
+            ResponseRule(
+                texts=r["texts"] if "texts" in r else [r["text"]],
+                match=re.compile(r["match"], re.IGNORECASE | re.DOTALL) if r.get("match") else None,
+                model=r.get("model"),
+            )
+            for r in d.get("responses", [])
+        ]
+        if d.get("include_default_rules", True):
+            rules.extend(DEFAULT_RULES)
+        return cls(
+            latency=LatencyModel(dist=dist, params=ttft, tokens_per_sec=float(latency.get("tokens_per_sec", 0.0))),
+            errors=ErrorInjection(
+                rate=float(errors.get("rate", 0.0)),
+                status=list(errors.get("status", [500])),
+                hang_rate=float(errors.get("hang_rate", 0.0)),
+                hang_seconds=float(errors.get("hang_seconds", 60.0)),
+            ),
+            rules=rules,
+            default_text=d.get("default_text", DEFAULT_TEXT),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FakeLLMScript":
+        return cls.from_dict(tomllib.loads(Path(path).read_text()))
+
+    def respond(self, model: str, prompt: str) -> str:
+        for rule in self.rules:
+            if rule.matches(model, prompt):
+                return rule.next_text()
+        return self.default_text
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into pseudo-tokens that concatenate back to the original."""
+    return re.findall(r"\s*\S+|\s+", text) or [""]
+
+
+def schema_instance(schema: dict[str, Any], defs: dict[str, Any] | None = None) -> Any:
+    """Build a minimal value conforming to an OpenAPI/JSON schema."""
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+    if "$ref" in schema:
+        return schema_instance(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if schema.get(key):
+            return schema_instance(schema[key][0], defs)
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    match str(schema.get("type", "object")).lower():
+        case "object":
+            return {k: schema_instance(v, defs) for k, v in schema.get("properties", {}).items()}
+        case "array":
+            return [schema_instance(schema.get("items", {}), defs)]
+        case "number":
+            return 0.5
+        case "integer":
+            return 1
+        case "boolean":
+            return True
+        case "null":
+            return None
+        case _:
+            return "stub"
+
+
+class FakeLLMServer:
+    """Starlette app implementing the subset of provider APIs used by the scenarios."""
+
+    def __init__(self, script: FakeLLMScript, seed: int | None = None):
+        self.script = script
+        self.stats: dict[str, int] = {"requests": 0, "errors": 0, "hangs": 0, "streams": 0}
+        if seed is not None:
+            random.seed(seed)
+
+    def build(self):
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        return Starlette(routes=[
+            Route("/v1/chat/completions", self.openai_chat, methods=["POST"]),
+            Route("/openai/v1/chat/completions", self.openai_chat, methods=["POST"]),
+            Route("/chat/completions", self.openai_chat, methods=["POST"]),
+            Route("/{version}/models/{model_action:path}", self.gemini_generate, methods=["POST"]),
+            Route("/health", self.health, methods=["GET"]),
+            Route("/stats", self.get_stats, methods=["GET"]),
+        ])
+
+    async def health(self, request):
+        from starlette.responses import JSONResponse
+        return JSONResponse({"status": "healthy"})
+
+    async def get_stats(self, request):
+        from starlette.responses import JSONResponse
+        return JSONResponse(self.stats)
+
+    async def _inject_faults(self):
+        """Returns an error response to send instead of a completion, if any."""
+        from starlette.responses import JSONResponse
+
+        self.stats["requests"] += 1
+        errors = self.script.errors
+        if errors.hang_rate and random.random() < errors.hang_rate:
+            self.stats["hangs"] += 1
+            await asyncio.sleep(errors.hang_seconds)
+        if errors.rate and random.random() < errors.rate:
+            self.stats["errors"] += 1
+            status = random.choice(errors.status)
+            return JSONResponse(
+                {"error": {"code": status, "message": "Injected error from fake LLM server", "status": "INJECTED"}},
+                status_code=status,
+            )
+        return None
+
+    async def _emit(self, text: str):
+        """Yields tokens of `text` paced according to the latency model."""
+        latency = self.script.latency
+        await asyncio.sleep(latency.ttft())
+        delay = latency.token_delay()
+        for i, token in enumerate(tokenize(text)):
+            if i and delay:
+                await asyncio.sleep(delay)
+            yield token
+
+    async def openai_chat(self, request):
+        from starlette.responses import JSONResponse, StreamingResponse
+
+        body = await request.json()
+        if (error := await self._inject_faults()) is not None:
+            return error
+        model = body.get("model", "")
+        prompt = "\n".join(_openai_content_text(m.get("content")) for m in body.get("messages", []))
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            text = json.dumps(schema_instance(response_format.get("json_schema", {}).get("schema", {})))
+        else:
+            text = self.script.respond(model, prompt)
+        completion_id = f"chatcmpl-{uuid4().hex}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": len(tokenize(prompt)),
+            "completion_tokens": len(tokenize(text)),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            self.stats["streams"] += 1
+
+            async def sse():
+                def chunk(delta: dict, finish_reason: str | None = None, **extra) -> str:
+                    data = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                        **extra,
+                    }
+                    return f"data: {json.dumps(data)}\n\n"
+
+                yield chunk({"role": "assistant", "content": ""})
+                async for token in self._emit(text):
+                    yield chunk({"content": token})
+                yield chunk({}, "stop", usage=usage)
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        async for _ in self._emit(text):
+            pass
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+            "service_tier": "default",
+        })
+
+    async def gemini_generate(self, request):
+        from starlette.responses import JSONResponse, StreamingResponse
+
+        model, _, action = request.path_params["model_action"].partition(":")
+        if action not in ("generateContent", "streamGenerateContent"):
+            return JSONResponse({"error": {"code": 404, "message": f"Unsupported action: {action}"}}, status_code=404)
+        body = await request.json()
+        if (error := await self._inject_faults()) is not None:
+            return error
+
+        contents = list(body.get("contents", []))
+        if body.get("systemInstruction"):
+            contents.insert(0, body["systemInstruction"])
+        prompt = "\n".join(p.get("text", "") for c in contents for p in c.get("parts", []))
+        gen_config = body.get("generationConfig", {})
+        schema = gen_config.get("responseJsonSchema") or gen_config.get("responseSchema")
+        if schema:
+            text = json.dumps(schema_instance(schema))
+        else:
+            text = self.script.respond(model, prompt)
+        usage = {
+            "promptTokenCount": len(tokenize(prompt)),
+            "candidatesTokenCount": len(tokenize(text)),
+        }
+        usage["totalTokenCount"] = usage["promptTokenCount"] + usage["candidatesTokenCount"]
+
+        def response(chunk: str, finished: bool) -> dict:
+            candidate = {"content": {"role": "model", "parts": [{"text": chunk}]}, "index": 0}
+            if finished:
+                candidate["finishReason"] = "STOP"
+            return {"candidates": [candidate], "usageMetadata": usage, "modelVersion": model}
+
+        if action == "streamGenerateContent":
+            self.stats["streams"] += 1
+
+            async def sse():
+                async for token in self._emit(text):
+                    yield f"data: {json.dumps(response(token, False))}\n\n"
+                yield f"data: {json.dumps(response('', True))}\n\n"
+
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        async for _ in self._emit(text):
+            pass
+        return JSONResponse(response(text, True))
+
+
+def _openai_content_text(content: Any) -> str:
+    if isinstance(content, list):
+        return "\n".join(c.get("text", "") for c in content if isinstance(c, dict))
+    return content or ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI/Groq/Gemini-compatible LLM server.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind the server")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind the server")
+    parser.add_argument("--script", type=str, help="TOML file with responses, latency and error settings")
+    parser.add_argument("--seed", type=int, help="Seed for latency and error sampling")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    script = FakeLLMScript.load(args.script) if args.script else FakeLLMScript()
+    server = FakeLLMServer(script, seed=args.seed)
+    uvicorn.run(server.build(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
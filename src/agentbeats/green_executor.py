@@ -7,8 +7,8 @@ from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     InvalidParamsError,
     Task,
+    TaskNotFoundError,
     TaskState,
-    UnsupportedOperationError,
     InternalError,
 )
 from a2a.utils import (
@@ -74,4 +74,10 @@ class GreenExecutor(AgentExecutor):
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
-        raise ServerError(error=UnsupportedOperationError())
+        # The request handler cancels the asyncio task running execute(), which
+        # propagates CancelledError through run_eval and any in-flight calls.
+        task = request.current_task
+        if not task:
+            raise ServerError(error=TaskNotFoundError())
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        await updater.cancel(new_agent_text_message("Assessment canceled.", context_id=task.context_id))
@@ -0,0 +1,113 @@
+"""Participant health tracking with a per-endpoint circuit breaker.
+
+Green agents call participants through a `HealthRegistry`. After
+`failure_threshold` consecutive failures an endpoint's circuit opens and calls
+to it fail immediately with `CircuitOpenError` instead of waiting out a full
+turn timeout. Once `cooldown` seconds have passed, one probe call is let
+through: success closes the circuit, failure reopens it.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+
+logger = logging.getLogger("agentbeats.health")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+@dataclass
+class ParticipantHealth:
+    url: str
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    total_calls: int = 0
+    total_failures: int = 0
+    opened_at: float | None = None
+    last_error: str | None = None
+    probing: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_calls": self.total_calls,
+            "total_failures": self.total_failures,
+            "last_error": self.last_error,
+        }
+
+
+class HealthRegistry:
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._participants: dict[str, ParticipantHealth] = {}
+
+    def get(self, url: str) -> ParticipantHealth:
+        if url not in self._participants:
+            self._participants[url] = ParticipantHealth(url)
+        return self._participants[url]
+
+    def _admit(self, health: ParticipantHealth) -> None:
+        if health.state == CLOSED:
+            return
+        if health.state == OPEN and time.monotonic() - health.opened_at >= self.cooldown:
+            health.state = HALF_OPEN
+        if health.state == HALF_OPEN and not health.probing:
+            health.probing = True
+            return
+        raise CircuitOpenError(
+            f"{health.url} is unavailable after {health.consecutive_failures} consecutive failures"
+            f" (last error: {health.last_error})")
+
+    def record_success(self, health: ParticipantHealth) -> None:
+        if health.state != CLOSED:
+            logger.info(f"{health.url} recovered, closing circuit")
+        health.state = CLOSED
+        health.consecutive_failures = 0
+        health.probing = False
+
+    def record_failure(self, health: ParticipantHealth, error: BaseException) -> None:
+        health.consecutive_failures += 1
+        health.total_failures += 1
+        health.last_error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+        if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+            if health.state != OPEN:
+                logger.warning(f"{health.url} failed {health.consecutive_failures} times in a row, opening circuit")
+            health.state = OPEN
+            health.opened_at = time.monotonic()
+        health.probing = False
+
+    async def call(self, url: str, fn: Callable[[], Awaitable[T]], timeout: float | None = None) -> T:
+        """Awaits `fn()` for the participant at `url`, failing fast while its circuit is open."""
+        health = self.get(url)
+        self._admit(health)
+        health.total_calls += 1
+        try:
+            result = await asyncio.wait_for(fn(), timeout)
+        except asyncio.CancelledError:
+            health.probing = False
+            raise
+        except asyncio.TimeoutError as e:
+            self.record_failure(health, e)
+            raise TimeoutError(f"{url} did not respond within {timeout}s") from e
+        except Exception as e:
+            self.record_failure(health, e)
+            raise
+        self.record_success(health)
+        return result
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [h.to_dict() for h in self._participants.values()]
@@ -0,0 +1,373 @@
+"""Shared LLM gateway for agents.
+
+All scenario agents send their LLM calls through one process-wide `LLMGateway`
+(see `get_gateway`), which provides:
+- async calls over pooled connections (litellm's shared HTTP clients for
+  OpenAI/Groq-style models, one reused google-genai client for Gemini)
+- per-provider token-bucket rate limiting, where callers wait in FIFO order
+  instead of hitting the provider and getting 429s, plus retry with backoff
+  for the 429s that still happen
+- optional LRU response caching for deterministic requests
+- per-assessment token and latency accounting via `gateway.assessment()`
+
+Limits and caching are configured with environment variables:
+    AGENTBEATS_LLM_LIMITS='{"groq": {"rpm": 30, "tpm": 6000, "concurrency": 4}}'
+    AGENTBEATS_LLM_CACHE_SIZE=1024
+"""
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Iterator, TypeVar
+
+from pydantic import BaseModel
+
+
+logger = logging.getLogger("agentbeats.llm")
+
+LIMITS_ENV = "AGENTBEATS_LLM_LIMITS"
+CACHE_SIZE_ENV = "AGENTBEATS_LLM_CACHE_SIZE"
+MAX_RETRIES = 5
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def provider_of(model: str) -> str:
+    """Provider name of a litellm-style model id, e.g. "groq/llama3-70b" -> "groq"."""
+    if "/" in model:
+        return model.split("/", 1)[0]
+    if model.startswith("gemini"):
+        return "gemini"
+    return "openai"
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/s up to `capacity`; waiters are served in FIFO order."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate * 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Waits until `amount` tokens are available and takes them. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= amount
+        return waited
+
+    def debit(self, amount: float) -> None:
+        """Takes tokens after the fact (e.g. actual completion tokens); may go negative."""
+        self._refill()
+        self._tokens -= amount
+
+
+@dataclass
+class ProviderLimits:
+    rpm: float | None = None  # requests per minute
+    tpm: float | None = None  # tokens per minute
+    concurrency: int | None = None  # requests in flight
+
+
+class _Provider:
+    def __init__(self, limits: ProviderLimits):
+        self.requests = TokenBucket(limits.rpm / 60, limits.rpm) if limits.rpm else None
+        self.tokens = TokenBucket(limits.tpm / 60, limits.tpm) if limits.tpm else None
+        self.semaphore = asyncio.Semaphore(limits.concurrency) if limits.concurrency else None
+
+    @contextlib.asynccontextmanager
+    async def slot(self, prompt_tokens: int):
+        """Holds a rate-limited request slot, yielding the seconds spent queueing."""
+        start = time.monotonic()
+        if self.requests:
+            await self.requests.acquire()
+        if self.tokens:
+            await self.tokens.acquire(prompt_tokens)
+        if self.semaphore:
+            await self.semaphore.acquire()
+        try:
+            yield time.monotonic() - start
+        finally:
+            if self.semaphore:
+                self.semaphore.release()
+
+
+@dataclass
+class LLMUsage:
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_seconds: float = 0.0
+    queue_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["latency_seconds"] = round(self.latency_seconds, 3)
+        d["queue_seconds"] = round(self.queue_seconds, 3)
+        return d
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float
+    cached: bool = False
+    parsed: Any = None
+
+
+_current_usage: contextvars.ContextVar[LLMUsage | None] = contextvars.ContextVar("agentbeats_llm_usage", default=None)
+
+
+class LLMGateway:
+
+    def __init__(self, limits: dict[str, ProviderLimits] | None = None, cache_size: int = 0):
+        self._limits = limits or {}
+        self._providers: dict[str, _Provider] = {}
+        self._cache: OrderedDict[str, LLMResponse] = OrderedDict()
+        self._cache_size = cache_size
+        self.total = LLMUsage()
+        self._genai_client = None
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        limits = {
+            provider: ProviderLimits(**cfg)
+            for provider, cfg in json.loads(os.getenv(LIMITS_ENV) or "{}").items()
+        }
+        return cls(limits=limits, cache_size=int(os.getenv(CACHE_SIZE_ENV) or 0))
+
+    def _provider(self, model: str) -> _Provider:
+        name = provider_of(model)
+        if name not in self._providers:
+            self._providers[name] = _Provider(self._limits.get(name, ProviderLimits()))
+        return self._providers[name]
+
+    @property
+    def genai_client(self):
+        if self._genai_client is None:
+            from google import genai
+            self._genai_client = genai.Client()
+        return self._genai_client
+
+    # accounting
+
+    @contextlib.contextmanager
+    def assessment(self) -> Iterator[LLMUsage]:
+        """Accounts LLM calls made in this context, and in tasks it spawns, to a fresh LLMUsage."""
+        usage = LLMUsage()
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+
+    def _record(self, response: LLMResponse | None, queued: float = 0.0) -> None:
+        for usage in (self.total, _current_usage.get()):
+            if usage is None:
+                continue
+            usage.queue_seconds += queued
+            if response is None:
+                usage.errors += 1
+            elif response.cached:
+                usage.calls += 1
+                usage.cache_hits += 1
+            else:
+                usage.calls += 1
+                usage.prompt_tokens += response.prompt_tokens
+                usage.completion_tokens += response.completion_tokens
+                usage.latency_seconds += response.latency
+
+    # caching
+
+    def _cache_key(self, *parts: Any) -> str | None:
+        if not self._cache_size:
+            return None
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _cache_get(self, key: str | None) -> LLMResponse | None:
+        if key is None or key not in self._cache:
+            return None
+        self._cache.move_to_end(key)
+        cached = self._cache[key]
+        return LLMResponse(cached.text, cached.prompt_tokens, cached.completion_tokens, 0.0, True, cached.parsed)
+
+    def _cache_put(self, key: str | None, response: LLMResponse) -> None:
+        if key is None:
+            return
+        self._cache[key] = response
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    # calls
+
+    async def _call(self, model: str, prompt_text: str, call):
+        """Runs `call()` inside the provider's rate limits, retrying rate-limit errors."""
+        provider = self._provider(model)
+        queued = 0.0
+        for attempt in range(MAX_RETRIES + 1):
+            delay = None
+            async with provider.slot(estimate_tokens(prompt_text)) as waited:
+                queued += waited
+                start = time.monotonic()
+                try:
+                    response = await call()
+                except Exception as e:
+                    if not (attempt < MAX_RETRIES and _is_rate_limit(e)):
+                        self._record(None, queued)
+                        raise
+                    delay = min(30.0, 0.5 * 2 ** attempt)
+            if delay is not None:
+                # Back off outside the slot, so other calls to the provider aren't held up
+                logger.warning(f"{model} rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                queued += delay
+                continue
+            response.latency = time.monotonic() - start
+            if provider.tokens:
+                provider.tokens.debit(response.completion_tokens)
+            self._record(response, queued)
+            return response
+
+    async def complete(self, model: str, messages: list[dict], *, cache: bool | None = None, **kwargs) -> LLMResponse:
+        """Chat completion through litellm.
+
+        Responses are cached when a cache is configured and either `cache` is
+        True or the request is deterministic (temperature 0).
+        """
+        use_cache = cache if cache is not None else kwargs.get("temperature") == 0
+        key = self._cache_key("complete", model, messages, kwargs) if use_cache else None
+        if (hit := self._cache_get(key)) is not None:
+            self._record(hit)
+            return hit
+
+        async def call() -> LLMResponse:
+            import litellm
+            response = await litellm.acompletion(model=model, messages=messages, **kwargs)
+            text = response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            return LLMResponse(
+                text=text,
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or estimate_tokens(text),
+                latency=0.0,
+            )
+
+        response = await self._call(model, _messages_text(messages), call)
+        self._cache_put(key, response)
+        return response
+
+    async def stream(self, model: str, messages: list[dict], **kwargs) -> AsyncIterator[str]:
+        """Streams completion deltas through litellm. Streams are never cached."""
+        provider = self._provider(model)
+        prompt_text = _messages_text(messages)
+        async with provider.slot(estimate_tokens(prompt_text)) as queued:
+            import litellm
+            start = time.monotonic()
+            chunks: list[str] = []
+            try:
+                response = await litellm.acompletion(model=model, messages=messages, stream=True, **kwargs)
+                async for chunk in response:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        chunks.append(delta)
+                        yield delta
+            except Exception:
+                self._record(None, queued)
+                raise
+        text = "".join(chunks)
+        if provider.tokens:
+            provider.tokens.debit(estimate_tokens(text))
+        self._record(LLMResponse(text, estimate_tokens(prompt_text), estimate_tokens(text), time.monotonic() - start), queued)
+
+    async def generate_structured(self, model: str, system: str, prompt: str, schema: type[T], *,
+                                  cache: bool | None = None, **kwargs) -> T:
+        """Generates an instance of `schema`. Gemini models use google-genai, others litellm.
+
+        Cached under the same rule as `complete`.
+        """
+        use_cache = cache if cache is not None else kwargs.get("temperature") == 0
+        key = self._cache_key("structured", model, system, prompt, schema.__name__, kwargs) if use_cache else None
+        if (hit := self._cache_get(key)) is not None:
+            self._record(hit)
+            return hit.parsed
+
+        if provider_of(model) == "gemini":
+            async def call() -> LLMResponse:
+                from google import genai
+                response = await self.genai_client.aio.models.generate_content(
+                    model=model.removeprefix("gemini/"),
+                    config=genai.types.GenerateContentConfig(
+                        system_instruction=system,
+                        response_mime_type="application/json",
+                        response_schema=schema,
+                        **kwargs,
+                    ),
+                    contents=prompt,
+                )
+                usage = response.usage_metadata
+                text = response.text or ""
+                parsed = response.parsed if isinstance(response.parsed, schema) else schema.model_validate_json(text)
+                return LLMResponse(
+                    text=text,
+                    prompt_tokens=(usage.prompt_token_count or 0) if usage else estimate_tokens(system + prompt),
+                    completion_tokens=(usage.candidates_token_count or 0) if usage else estimate_tokens(text),
+                    latency=0.0,
+                    parsed=parsed,
+                )
+
+            response = await self._call(model, system + prompt, call)
+        else:
+            messages = [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
+            response = await self.complete(model, messages, cache=False, response_format=schema, **kwargs)
+            response.parsed = schema.model_validate_json(response.text)
+
+        self._cache_put(key, response)
+        return response.parsed
+
+
+def _messages_text(messages: list[dict]) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+
+def _is_rate_limit(e: Exception) -> bool:
+    return getattr(e, "status_code", None) == 429 or getattr(e, "code", None) == 429 or type(e).__name__ == "RateLimitError"
+
+
+_gateway: LLMGateway | None = None
+
+
+def get_gateway() -> LLMGateway:
+    """The process-wide gateway, configured from the environment on first use."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway.from_env()
+    return _gateway
@@ -0,0 +1,334 @@
+"""Load generator for green agents.
+
+Submits many EvalRequests built from a scenario TOML to its green agent, either
+closed-loop at a fixed concurrency or open-loop at a target arrival rate, and
+tracks each task's lifecycle over the SSE stream:
+
+    agentbeats-load scenarios/debate/scenario.toml --concurrency 8 --total 100
+    agentbeats-load scenarios/tau2/scenario.toml --rate 0.5 --duration 600 -o load.json
+
+Requests can be parameterized with a `[load]` table in the scenario TOML. Each
+`[[load.variants]]` entry is merged over `[config]`, and variants are used
+round-robin:
+
+    [load]
+    concurrency = 4
+    total = 40
+
+    [[load.variants]]
+    topic = "Should artificial intelligence be regulated?"
+
+    [[load.variants]]
+    topic = "Should remote work be the default?"
+
+Reported per assessment:
+- queueing delay: request sent until the task is acknowledged (first event)
+- time to first status: request sent until the first `working` status update
+- completion latency: request sent until the task reaches a terminal state
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import random
+import sys
+import time
+import tomllib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from agentbeats.client_cli import parse_toml
+
+# httpx and a2a are imported where used, so `--help` and bad arguments return immediately
+if TYPE_CHECKING:
+    from agentbeats.models import EvalRequest
+
+
+TERMINAL_STATES = {"completed", "failed", "canceled", "rejected"}
+ERROR_CHARS = 200  # error messages are truncated to keep traces and outcome keys readable
+
+
+@dataclass
+class AssessmentTrace:
+    """Lifecycle timestamps of one assessment, in seconds relative to `sent`."""
+    index: int
+    sent: float
+    first_event: float | None = None
+    first_status: float | None = None
+    finished: float | None = None
+    status_times: list[float] = field(default_factory=list)
+    artifacts: int = 0
+    state: str = "unknown"
+    task_id: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.state == "completed"
+
+    @property
+    def turn_gaps(self) -> list[float]:
+        """Time between consecutive `working` status updates."""
+        return [b - a for a, b in zip(self.status_times, self.status_times[1:])]
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """p50/p95/p99 (linear interpolation), mean and max of `values`."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(q: float) -> float:
+        k = (len(ordered) - 1) * q
+        lo = int(k)
+        hi = min(lo + 1, len(ordered) - 1)
+        return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+    return {
+        "p50": round(pct(0.50), 4),
+        "p95": round(pct(0.95), 4),
+        "p99": round(pct(0.99), 4),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "max": round(ordered[-1], 4),
+        "count": len(ordered),
+    }
+
+
+async def track_assessment(client, request: "EvalRequest", index: int = 0, timeout: float | None = None) -> AssessmentTrace:
+    """Sends `request` with an A2A client and records its lifecycle."""
+    from a2a.types import Message, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+    from agentbeats.client import create_message
+
+    start = time.perf_counter()
+    trace = AssessmentTrace(index=index, sent=time.time())
+
+    def now() -> float:
+        return time.perf_counter() - start
+
+    async def consume():
+        events = client.send_message(create_message(text=request.model_dump_json()))
+        async with contextlib.aclosing(events):
+            async for event in events:
+                consume_event(event)
+                if trace.state in TERMINAL_STATES:
+                    break
+
+    def consume_event(event):
+        if trace.first_event is None:
+            trace.first_event = now()
+        match event:
+            case Message():
+                trace.state = "completed"
+            case (task, TaskStatusUpdateEvent() as update):
+                trace.task_id = task.id
+                trace.state = update.status.state.value
+                if trace.state == "working":
+                    t = now()
+                    trace.status_times.append(t)
+                    if trace.first_status is None:
+                        trace.first_status = t
+            case (task, TaskArtifactUpdateEvent()):
+                trace.task_id = task.id
+                trace.artifacts += 1
+            case (task, None):
+                trace.task_id = task.id
+                trace.state = task.status.state.value
+                trace.artifacts = len(task.artifacts or [])
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except asyncio.TimeoutError:
+        trace.error = "timeout"
+    except Exception as e:
+        trace.error = f"{type(e).__name__}: {e}"[:ERROR_CHARS]
+    trace.finished = now()
+    return trace
+
+
+def request_variants(req: "EvalRequest", variants: list[dict[str, Any]]) -> Iterator["EvalRequest"]:
+    """Yields `req` with each variant merged over its config, round-robin."""
+    if not variants:
+        while True:
+            yield req
+    for variant in itertools.cycle(variants):
+        yield req.model_copy(update={"config": {**req.config, **variant}})
+
+
+@dataclass
+class LoadSettings:
+    concurrency: int | None = None  # closed loop: assessments kept in flight
+    rate: float | None = None  # open loop: new assessments per second
+    total: int | None = None
+    duration: float | None = None  # seconds to keep submitting
+    max_in_flight: int = 256  # open loop safety cap
+    poisson: bool = False
+    timeout: float | None = None
+
+
+async def generate_load(green_url: str, requests: Iterator["EvalRequest"], settings: LoadSettings,
+                        on_trace=None) -> tuple[list[AssessmentTrace], float, int]:
+    """Runs the load pattern, returning traces, wall time and peak in-flight assessments."""
+    import httpx
+    from a2a.client import A2ACardResolver, ClientConfig, ClientFactory
+    from agentbeats.client import DEFAULT_TIMEOUT
+
+    if settings.total is None and settings.duration is None:
+        raise ValueError("Either total or duration must be set")
+    pool = settings.concurrency or settings.max_in_flight
+    limits = httpx.Limits(max_connections=pool + 8, max_keepalive_connections=pool + 8)
+    traces: list[AssessmentTrace] = []
+    in_flight = peak = 0
+    launched = 0
+
+    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=limits) as httpx_client:
+        card = await A2ACardResolver(httpx_client=httpx_client, base_url=green_url).get_agent_card()
+        client = ClientFactory(ClientConfig(httpx_client=httpx_client, streaming=True)).create(card)
+
+        start = time.perf_counter()
+
+        def more() -> bool:
+            if settings.duration is not None and time.perf_counter() - start >= settings.duration:
+                return False
+            return settings.total is None or launched < settings.total
+
+        def launch() -> int:
+            nonlocal launched
+            launched += 1
+            return launched - 1
+
+        async def run_one(request: "EvalRequest", index: int):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                trace = await track_assessment(client, request, index, settings.timeout)
+            finally:
+                in_flight -= 1
+            traces.append(trace)
+            if on_trace:
+                on_trace(trace)
+
+        if settings.rate:
+            sem = asyncio.Semaphore(settings.max_in_flight)
+            tasks: set[asyncio.Task] = set()
+            next_at = time.perf_counter()
+            while more():
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                interval = random.expovariate(settings.rate) if settings.poisson else 1 / settings.rate
+                next_at += interval
+                if sem.locked():
+                    # Over the in-flight cap: count as a dropped arrival rather than queueing locally
+                    traces.append(AssessmentTrace(index=launch(), sent=time.time(), error="dropped", finished=0.0))
+                    continue
+                await sem.acquire()
+                task = asyncio.create_task(run_one(next(requests), launch()))
+                task.add_done_callback(lambda t: sem.release())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+            async def worker():
+                while more():
+                    await run_one(next(requests), launch())
+
+            await asyncio.gather(*(worker() for _ in range(settings.concurrency or 1)))
+
+        return traces, time.perf_counter() - start, peak
+
+
+def summarize(traces: list[AssessmentTrace], wall: float, peak: int) -> dict[str, Any]:
+    ok = [t for t in traces if t.ok]
+    outcomes: dict[str, int] = {}
+    for t in traces:
+        key = "completed" if t.ok else (t.error or t.state)
+        outcomes[key] = outcomes.get(key, 0) + 1
+    return {
+        "submitted": len(traces),
+        "completed": len(ok),
+        "error_rate": round(1 - len(ok) / len(traces), 4) if traces else 0.0,
+        "outcomes": outcomes,
+        "wall_seconds": round(wall, 3),
+        "throughput_per_sec": round(len(ok) / wall, 4) if wall > 0 else 0.0,
+        "peak_in_flight": peak,
+        "queueing_delay": percentiles([t.first_event for t in traces if t.first_event is not None]),
+        "time_to_first_status": percentiles([t.first_status for t in traces if t.first_status is not None]),
+        "completion_latency": percentiles([t.finished for t in ok if t.finished is not None]),
+    }
+
+
+def print_summary(summary: dict[str, Any]) -> None:
+    print(f"Submitted {summary['submitted']}, completed {summary['completed']} "
+          f"({summary['error_rate']:.1%} errors) in {summary['wall_seconds']}s "
+          f"-> {summary['throughput_per_sec']} assessments/s, peak in flight {summary['peak_in_flight']}")
+    print(f"Outcomes: {summary['outcomes']}")
+    for key in ("queueing_delay", "time_to_first_status", "completion_latency"):
+        p = summary[key]
+        if p:
+            print(f"  {key:22s} p50={p['p50']:.3f}s p95={p['p95']:.3f}s p99={p['p99']:.3f}s max={p['max']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate assessment load against a green agent")
+    parser.add_argument("scenario", help="Path to scenario TOML file")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("-c", "--concurrency", type=int, help="Closed loop: assessments kept in flight")
+    mode.add_argument("-r", "--rate", type=float, help="Open loop: assessments started per second")
+    parser.add_argument("-n", "--total", type=int, help="Number of assessments to submit")
+    parser.add_argument("-d", "--duration", type=float, help="Seconds to keep submitting")
+    parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times in rate mode")
+    parser.add_argument("--max-in-flight", type=int, help="Rate mode cap; arrivals above it are dropped")
+    parser.add_argument("--timeout", type=float, help="Per-assessment timeout in seconds")
+    parser.add_argument("-o", "--output", type=str, help="Write summary and per-assessment traces as JSON")
+    args = parser.parse_args()
+
+    scenario_path = Path(args.scenario)
+    if not scenario_path.exists():
+        print(f"File not found: {scenario_path}")
+        sys.exit(1)
+    data = tomllib.loads(scenario_path.read_text())
+    req, green_url, _ = parse_toml(data)
+    load_cfg = data.get("load", {}) or {}
+
+    settings = LoadSettings(
+        concurrency=args.concurrency or (None if args.rate else load_cfg.get("concurrency")),
+        rate=args.rate or (None if args.concurrency else load_cfg.get("rate")),
+        total=args.total or load_cfg.get("total"),
+        duration=args.duration or load_cfg.get("duration"),
+        max_in_flight=args.max_in_flight or load_cfg.get("max_in_flight", LoadSettings.max_in_flight),
+        poisson=args.poisson or bool(load_cfg.get("poisson", False)),
+        timeout=args.timeout or load_cfg.get("timeout"),
+    )
+    if settings.total is None and settings.duration is None:
+        settings.total = 10
+    if not settings.rate and not settings.concurrency:
+        settings.concurrency = 1
+
+    def progress(trace: AssessmentTrace):
+        status = "ok" if trace.ok else (trace.error or trace.state)
+        print(f"  #{trace.index} {status} in {trace.finished:.2f}s")
+
+    traces, wall, peak = asyncio.run(generate_load(
+        green_url, request_variants(req, load_cfg.get("variants", [])), settings, on_trace=progress))
+    summary = summarize(traces, wall, peak)
+    print_summary(summary)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump({
+                "green_agent": green_url,
+                "settings": asdict(settings),
+                "summary": summary,
+                "traces": [asdict(t) for t in sorted(traces, key=lambda t: t.index)],
+            }, f, indent=2)
+        print(f"Results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Multiplexing of launched agents' output.
+
+Each agent started with a `LogMux` writes its stdout and stderr to a pipe,
+which a dedicated thread drains continuously, so an agent never blocks on a
+full pipe however verbose it is. Every line is prefixed with a timestamp and
+the agent's role, then:
+- kept in a per-role ring buffer of the last `buffer_lines` lines, which can
+  be dumped when something fails
+- optionally written to `<log_dir>/<role>.log`, rotated at `max_bytes`
+- optionally echoed to the terminal through a bounded queue, where lines are
+  dropped (and counted) rather than stalling the agent if the terminal falls
+  behind
+"""
+import logging
+import logging.handlers
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+MAX_LINE = 64 * 1024  # longer lines are split
+ECHO_QUEUE_LINES = 10_000
+
+
+class _Prefixer:
+    """Prefixes lines with a millisecond timestamp and role, formatting each second only once."""
+
+    def __init__(self, role: str):
+        self.role = role
+        self._second = -1
+        self._stamp = ""
+
+    def __call__(self, line: str) -> str:
+        now = time.time()
+        second = int(now)
+        if second != self._second:
+            self._second = second
+            self._stamp = time.strftime("%H:%M:%S", time.localtime(second))
+        return f"{self._stamp}.{int(now * 1000) % 1000:03d} [{self.role}] {line}"
+
+
+class LogMux:
+
+    def __init__(self, buffer_lines: int = 2000, echo: bool = False, log_dir: Path | None = None,
+                 max_bytes: int = 10 * 2**20, backups: int = 3):
+        self.buffer_lines = buffer_lines
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffers: dict[str, deque[str]] = {}
+        self.dropped = 0  # echoed lines dropped because the terminal fell behind
+        self._files: dict[str, logging.Handler] = {}
+        self._pumps: list[threading.Thread] = []
+        self._echo: queue.Queue | None = None
+        self._closed = False
+        self._files_lock = threading.Lock()  # pumps write to the log files under it; close() takes it
+        if echo:
+            self._echo = queue.Queue(ECHO_QUEUE_LINES)
+            threading.Thread(target=self._write_echo, name="logmux-echo", daemon=True).start()
+
+    def _file(self, role: str) -> logging.Handler | None:
+        if self.log_dir is None:
+            return None
+        with self._files_lock:
+            if self._closed:
+                return None
+            if role not in self._files:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_dir / f"{role}.log", maxBytes=self.max_bytes, backupCount=self.backups)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._files[role] = handler
+            return self._files[role]
+
+    def attach(self, role: str, proc: subprocess.Popen) -> None:
+        """Starts draining `proc.stdout`, which must be a binary pipe."""
+        buffer = self.buffers.setdefault(role, deque(maxlen=self.buffer_lines))
+        pump = threading.Thread(target=self._pump, args=(role, proc, buffer), name=f"logmux-{role}", daemon=True)
+        self._pumps.append(pump)
+        pump.start()
+
+    def _pump(self, role: str, proc: subprocess.Popen, buffer: deque[str]) -> None:
+        handler = self._file(role)
+        prefix = _Prefixer(role)
+        with proc.stdout:
+            while chunk := proc.stdout.readline(MAX_LINE):
+                line = prefix(chunk.decode(errors="replace").rstrip("\n"))
+                buffer.append(line)
+                if handler:
+                    with self._files_lock:
+                        # A closed RotatingFileHandler would reopen its file and leak it
+                        if not self._closed:
+                            handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO}))
+                if self._echo:
+                    try:
+                        self._echo.put_nowait(line)
+                    except queue.Full:
+                        self.dropped += 1
+
+    def _write_echo(self) -> None:
+        try:
+            while True:
+                line = self._echo.get()
+                sys.stdout.write(line + "\n")
+                if self._echo.empty():
+                    sys.stdout.flush()
+        except (OSError, ValueError):  # terminal or pipe went away
+            self._echo = None
+
+    def tail(self, role: str, lines: int | None = None) -> list[str]:
+        buffer = list(self.buffers.get(role, ()))
+        return buffer[-lines:] if lines else buffer
+
+    def dump(self, roles: list[str] | None = None, lines: int | None = None, file=None) -> None:
+        """Prints the buffered output of `roles` (default: every agent)."""
+        file = file or sys.stdout
+        for role in roles or list(self.buffers):
+            buffered = self.tail(role, lines)
+            print(f"---- last {len(buffered)} lines of {role} ----", file=file)
+            for line in buffered:
+                print(line, file=file)
+        if self.dropped:
+            print(f"({self.dropped} lines were not echoed because the terminal fell behind)", file=file)
+        file.flush()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Waits briefly for exited agents' remaining output, then closes the log files."""
+        deadline = time.monotonic() + timeout
+        for pump in self._pumps:
+            pump.join(max(0.0, deadline - time.monotonic()))
+        with self._files_lock:
+            self._closed = True
+            for handler in self._files.values():
+                handler.close()
+            self._files.clear()
@@ -0,0 +1,93 @@
+"""Resource sampling of launched agent process groups via /proc (Linux only)."""
+import os
+import time
+from dataclasses import dataclass, field
+
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class ProcSample:
+    timestamp: float
+    cpu_seconds: float  # cumulative user + system time of live group members
+    rss_bytes: int
+    num_fds: int
+    num_procs: int
+
+
+def _read_stat(pid: int) -> list[str] | None:
+    """Fields of /proc/<pid>/stat following the command name (field 3 onwards)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    return stat[stat.rfind(")") + 2:].split()
+
+
+def group_pids(pgid: int) -> list[int]:
+    """PIDs of all live processes in process group `pgid`."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        fields = _read_stat(int(entry))
+        if fields and int(fields[2]) == pgid:
+            pids.append(int(entry))
+    return pids
+
+
+def sample_group(pgid: int) -> ProcSample | None:
+    """Aggregate CPU time, RSS and open FDs over a process group, or None if it is gone."""
+    cpu_ticks = rss_pages = num_fds = num_procs = 0
+    for pid in group_pids(pgid):
+        fields = _read_stat(pid)
+        if not fields or fields[0] == "Z":
+            continue
+        num_procs += 1
+        cpu_ticks += int(fields[11]) + int(fields[12])
+        rss_pages += int(fields[21])
+        try:
+            num_fds += len(os.listdir(f"/proc/{pid}/fd"))
+        except OSError:
+            pass
+    if not num_procs:
+        return None
+    return ProcSample(
+        timestamp=time.time(),
+        cpu_seconds=cpu_ticks / CLK_TCK,
+        rss_bytes=rss_pages * PAGE_SIZE,
+        num_fds=num_fds,
+        num_procs=num_procs,
+    )
+
+
+@dataclass
+class GroupStats:
+    """Samples collected for one process group."""
+    pgid: int
+    samples: list[ProcSample] = field(default_factory=list)
+
+    def sample(self) -> ProcSample | None:
+        s = sample_group(self.pgid)
+        if s:
+            self.samples.append(s)
+        return s
+
+    def summary(self) -> dict[str, float]:
+        if not self.samples:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        wall = last.timestamp - first.timestamp
+        cpu = max(0.0, last.cpu_seconds - first.cpu_seconds)
+        rss = [s.rss_bytes for s in self.samples]
+        return {
+            "cpu_seconds": round(cpu, 3),
+            "cpu_percent": round(100 * cpu / wall, 1) if wall > 0 else 0.0,
+            "rss_peak_mb": round(max(rss) / 2**20, 1),
+            "rss_mean_mb": round(sum(rss) / len(rss) / 2**20, 1),
+            "fds_peak": max(s.num_fds for s in self.samples),
+            "samples": len(self.samples),
+        }
@@ -1,59 +1,126 @@
 import argparse
 import asyncio
+import functools
+import json
 import os, sys, time, subprocess, shlex, signal
+import re
+import socket
+import tempfile
 from pathlib import Path
 import tomllib
-import httpx
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from a2a.client import A2ACardResolver
+from agentbeats.logmux import LogMux
+from agentbeats.supervisor import RESTART_POLICIES, RestartPolicy, Supervisor
 
+# httpx, dotenv, a2a and the client are imported where used, so that the CLI
+# starts (and launches agents) without paying for them up front.
+if TYPE_CHECKING:
+    from agentbeats.client_cli import AssessmentResult
 
-load_dotenv(override=True)
 
+PROBE_TIMEOUT = 2.0  # per request
+PROBE_INITIAL_DELAY = 0.005
+PROBE_MAX_DELAY = 0.5
 
-async def wait_for_agents(cfg: dict, timeout: int = 30) -> bool:
-    """Wait for all agents to be healthy and responding."""
-    endpoints = []
 
-    # Collect all endpoints to check
+@dataclass
+class AgentReadiness:
+    role: str
+    endpoint: str
+    ready_after: float | None = None  # seconds since probing started
+    probes: int = 0
+    exit_code: int | None = None  # set if the agent process died while starting
+    last_error: str | None = None
+
+    def describe(self) -> str:
+        if self.ready_after is not None:
+            return f"ready after {self.ready_after:.3f}s ({self.probes} probes)"
+        if self.exit_code is not None:
+            return f"process exited with code {self.exit_code}"
+        return f"not ready ({self.last_error or 'not probed'}, {self.probes} probes)"
+
+
+def agent_endpoints(cfg: dict) -> list[tuple[str, str]]:
+    """(role, endpoint) of every agent with a `cmd`, in the order start_agents launches them."""
+    endpoints = []
     for p in cfg["participants"]:
         if p.get("cmd"):  # Only check if there's a command (agent to start)
-            endpoints.append(f"http://{p['host']}:{p['port']}")
-
+            endpoints.append((p["role"], f"http://{p['host']}:{p['port']}"))
     if cfg["green_agent"].get("cmd"):  # Only check if there's a command (host to start)
-        endpoints.append(f"http://{cfg['green_agent']['host']}:{cfg['green_agent']['port']}")
-
-    if not endpoints:
+        endpoints.append(("green_agent", f"http://{cfg['green_agent']['host']}:{cfg['green_agent']['port']}"))
+    return endpoints
+
+
+async def probe_agents(cfg: dict, timeout: float = 30, procs: list[subprocess.Popen] | None = None) -> list[AgentReadiness]:
+    """Probe all agents concurrently until each serves its agent card.
+
+    Each agent is probed with exponential backoff starting at a few
+    milliseconds and is no longer probed once ready. `procs`, as returned by
+    start_agents, lets probing stop as soon as an agent process has died.
+    """
+    import httpx
+    from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+    agents = [AgentReadiness(role, endpoint) for role, endpoint in agent_endpoints(cfg)]
+    agent_procs = dict(zip((a.role for a in agents), procs or []))
+    start = time.monotonic()
+    deadline = start + timeout
+
+    async def probe(client: httpx.AsyncClient, agent: AgentReadiness) -> bool:
+        delay = PROBE_INITIAL_DELAY
+        proc = agent_procs.get(agent.role)
+        while True:
+            if proc is not None and proc.poll() is not None:
+                agent.exit_code = proc.returncode
+                return False
+            agent.probes += 1
+            try:
+                response = await client.get(agent.endpoint + AGENT_CARD_WELL_KNOWN_PATH)
+                if response.status_code == 200:
+                    agent.ready_after = time.monotonic() - start
+                    return True
+                agent.last_error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                # Any exception means the agent is not ready
+                agent.last_error = type(e).__name__
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+
+    async with httpx.AsyncClient(timeout=PROBE_TIMEOUT) as client:
+        tasks = [asyncio.create_task(probe(client, agent)) for agent in agents]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if not await next_done:
+                    break  # one agent died or timed out, the scenario can't run
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return agents
+
+
+async def wait_for_agents(cfg: dict, timeout: int = 30, procs: list[subprocess.Popen] | None = None) -> bool:
+    """Wait for all agents to be healthy and responding, then print how long each took."""
+    if not agent_endpoints(cfg):
         return True  # No agents to wait for
 
-    print(f"Waiting for {len(endpoints)} agent(s) to be ready...")
-    start_time = time.time()
-
-    async def check_endpoint(endpoint: str) -> bool:
-        """Check if an endpoint is responding by fetching the agent card."""
-        try:
-            async with httpx.AsyncClient(timeout=2) as client:
-                resolver = A2ACardResolver(httpx_client=client, base_url=endpoint)
-                await resolver.get_agent_card()
-                return True
-        except Exception:
-            # Any exception means the agent is not ready
-            return False
-
-    while time.time() - start_time < timeout:
-        ready_count = 0
-        for endpoint in endpoints:
-            if await check_endpoint(endpoint):
-                ready_count += 1
-
-        if ready_count == len(endpoints):
-            return True
-
-        print(f"  {ready_count}/{len(endpoints)} agents ready, waiting...")
-        await asyncio.sleep(1)
-
-    print(f"Timeout: Only {ready_count}/{len(endpoints)} agents became ready after {timeout}s")
+    print(f"Waiting for {len(agent_endpoints(cfg))} agent(s) to be ready...")
+    agents = await probe_agents(cfg, timeout, procs)
+    for agent in agents:
+        print(f"  {agent.role:20s} {agent.endpoint:28s} {agent.describe()}")
+
+    ready = [a for a in agents if a.ready_after is not None]
+    if len(ready) == len(agents):
+        return True
+    if any(a.exit_code is not None for a in agents):
+        print("Error: an agent process exited during startup")
+    else:
+        print(f"Timeout: Only {len(ready)}/{len(agents)} agents became ready after {timeout}s")
     return False
 
 
@@ -75,6 +142,7 @@ def parse_toml(scenario_path: str) -> dict:
     green_ep = data.get("green_agent", {}).get("endpoint", "")
     g_host, g_port = host_port(green_ep)
     green_cmd = data.get("green_agent", {}).get("cmd", "")
+    green_restart = data.get("green_agent", {}).get("restart")
 
     parts = []
     for p in data.get("participants", []):
@@ -84,17 +152,268 @@ def parse_toml(scenario_path: str) -> dict:
                 "role": str(p.get("role", "")),
                 "host": h,
                 "port": pt,
-                "cmd": p.get("cmd", "")
+                "cmd": p.get("cmd", ""),
+                "restart": p.get("restart"),
             })
 
     cfg = data.get("config", {})
     return {
-        "green_agent": {"host": g_host, "port": g_port, "cmd": green_cmd},
+        "green_agent": {"host": g_host, "port": g_port, "cmd": green_cmd, "restart": green_restart},
         "participants": parts,
         "config": cfg,
     }
 
 
+def agent_env() -> dict[str, str]:
+    """Environment for launched agents, with .env loaded and this interpreter's bin dir on PATH."""
+    from dotenv import load_dotenv
+    load_dotenv(override=True)
+    parent_bin = str(Path(sys.executable).parent)
+    base_env = os.environ.copy()
+    base_env["PATH"] = parent_bin + os.pathsep + base_env.get("PATH", "")
+    return base_env
+
+
+def agent_commands(cfg: dict) -> list[tuple[str, str, list[str]]]:
+    """(role, host:port, command args) of every agent with a `cmd`, participants first, then the green agent."""
+    commands = []
+    for p in cfg["participants"]:
+        cmd_args = shlex.split(p.get("cmd", ""))
+        if cmd_args:
+            commands.append((p["role"], f"{p['host']}:{p['port']}", cmd_args))
+    green = cfg["green_agent"]
+    green_cmd_args = shlex.split(green.get("cmd", ""))
+    if green_cmd_args:
+        commands.append(("green_agent", f"{green['host']}:{green['port']}", green_cmd_args))
+    return commands
+
+
+def launch_agent(role: str, cmd_args: list[str], env: dict[str, str], sink=None,
+                 log_dir: Path | None = None, mux: LogMux | None = None) -> subprocess.Popen:
+    """Start one agent in its own session.
+
+    With `mux`, its output is piped to the LogMux; otherwise with `log_dir`
+    it goes to `<log_dir>/<role>.log`, and else to `sink`.
+    """
+    if mux is not None:
+        proc = subprocess.Popen(
+            cmd_args,
+            # Python block-buffers a pipe; unbuffered, lines reach the mux as they are written
+            env={**env, "PYTHONUNBUFFERED": "1"},
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        mux.attach(role, proc)
+        return proc
+    out = sink
+    if log_dir is not None:
+        out = open(log_dir / f"{role}.log", "w")
+    try:
+        return subprocess.Popen(
+            cmd_args,
+            env=env,
+            stdout=out, stderr=subprocess.STDOUT if log_dir is not None else out,
+            text=True,
+            start_new_session=True,
+        )
+    finally:
+        if log_dir is not None:
+            out.close()  # the child keeps its own descriptor
+
+
+def start_agents(cfg: dict, env: dict[str, str], sink=None,
+                 procs: list[subprocess.Popen] | None = None,
+                 log_dir: Path | None = None, mux: LogMux | None = None) -> list[subprocess.Popen]:
+    """Start every participant and the green agent that has a `cmd`, each in its own session.
+
+    Started processes are appended to `procs` as they are launched, so the
+    caller can still clean them up if a later launch fails. Agent output goes
+    to `mux` if given, else to `<log_dir>/<role>.log` with `log_dir`, else to `sink`.
+    """
+    procs = procs if procs is not None else []
+    for role, address, cmd_args in agent_commands(cfg):
+        print(f"Starting {'green agent' if role == 'green_agent' else role} at {address}")
+        procs.append(launch_agent(role, cmd_args, env, sink, log_dir, mux=mux))
+    return procs
+
+
+def stop_agents(procs: list[subprocess.Popen]) -> None:
+    """Terminate the process groups of `procs`, escalating to SIGKILL after 1s."""
+    for p in procs:
+        if p.poll() is None:
+            try:
+                os.killpg(p.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    time.sleep(1)
+    for p in procs:
+        if p.poll() is None:
+            try:
+                os.killpg(p.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def _toml_key(key: str) -> str:
+    return key if re.fullmatch(r"[A-Za-z0-9_-]+", key) else json.dumps(key)
+
+
+def _toml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value)  # JSON string escapes are valid TOML basic strings
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_toml_key(k)} = {_toml_value(v)}" for k, v in value.items()) + "}"
+    raise TypeError(f"Can't write {type(value).__name__} to TOML")
+
+
+def dump_toml(data: dict, prefix: tuple[str, ...] = ()) -> str:
+    """Serialize scenario data back to TOML (strings, numbers, booleans, arrays and tables)."""
+    lines, tables, arrays = [], [], []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            tables.append((key, value))
+        elif isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            arrays.append((key, value))
+        else:
+            lines.append(f"{_toml_key(key)} = {_toml_value(value)}")
+    for key, value in tables:
+        name = ".".join(_toml_key(k) for k in prefix + (key,))
+        lines += ["", f"[{name}]", dump_toml(value, prefix + (key,)).rstrip("\n")]
+    for key, items in arrays:
+        name = ".".join(_toml_key(k) for k in prefix + (key,))
+        for item in items:
+            lines += ["", f"[[{name}]]", dump_toml(item, prefix + (key,)).rstrip("\n")]
+    return "\n".join(lines).strip("\n") + "\n"
+
+
+def free_port(host: str, taken: set[int]) -> int:
+    """A port on `host` that is currently free and not in `taken`."""
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+        if port not in taken:
+            taken.add(port)
+            return port
+
+
+def isolate_scenario(data: dict, taken: set[int]) -> dict:
+    """Copy of raw scenario data with every locally started agent moved to a free port.
+
+    The agent's endpoint and its `cmd` are rewritten together; agents without
+    a `cmd` are shared between instances and keep their endpoint.
+    """
+    data = json.loads(json.dumps(data))
+    agents = [data.get("green_agent", {})] + list(data.get("participants", []))
+    for agent in agents:
+        if not agent.get("cmd") or not agent.get("endpoint"):
+            continue
+        match = re.match(r"(https?://)?([^:/]+):(\d+)(.*)", agent["endpoint"])
+        if not match:
+            raise ValueError(f"Can't parse endpoint {agent['endpoint']!r}")
+        scheme, host, old_port, rest = match.groups()
+        port_pattern = rf"(?<!\d){old_port}(?!\d)"
+        if not re.search(port_pattern, agent["cmd"]):
+            raise ValueError(f"cmd of {agent.get('role', 'green_agent')} does not contain its port {old_port}: {agent['cmd']!r}")
+        port = free_port(host, taken)
+        agent["endpoint"] = f"{scheme or ''}{host}:{port}{rest}"
+        agent["cmd"] = re.sub(port_pattern, str(port), agent["cmd"])
+    return data
+
+
+def run_instances(scenario_path: str, num_instances: int, env: dict[str, str],
+                  log_dir: Path, timeout: int = 30) -> bool:
+    """Run `num_instances` isolated copies of a scenario side by side and report throughput.
+
+    Each instance gets free ports and its own directory in `log_dir` holding
+    the rewritten scenario, one log per agent, the client log and results.
+    """
+    data = tomllib.loads(Path(scenario_path).read_text())
+    taken: set[int] = set()
+    instances = []
+    for i in range(num_instances):
+        inst_dir = log_dir / f"instance-{i}"
+        inst_dir.mkdir(parents=True, exist_ok=True)
+        inst_path = inst_dir / "scenario.toml"
+        inst_path.write_text(dump_toml(isolate_scenario(data, taken)))
+        instances.append({"dir": inst_dir, "path": inst_path, "cfg": parse_toml(str(inst_path)), "procs": []})
+    print(f"Running {num_instances} instances of {scenario_path}, logs in {log_dir}")
+
+    try:
+        for inst in instances:
+            start_agents(inst["cfg"], env, procs=inst["procs"], log_dir=inst["dir"])
+
+        async def wait_all():
+            return await asyncio.gather(*(
+                probe_agents(inst["cfg"], timeout, inst["procs"]) for inst in instances))
+
+        for i, agents in enumerate(asyncio.run(wait_all())):
+            for agent in agents:
+                if agent.ready_after is None:
+                    print(f"Error: instance {i} {agent.role} {agent.describe()}, see {instances[i]['dir'] / (agent.role + '.log')}")
+                    return False
+
+        start = time.monotonic()
+        for inst in instances:
+            with open(inst["dir"] / "client.log", "w") as log:
+                inst["client"] = subprocess.Popen(
+                    [sys.executable, "-m", "agentbeats.client_cli", str(inst["path"]), str(inst["dir"] / "results.json")],
+                    env=env, stdout=log, stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+            inst["procs"].append(inst["client"])
+        # Poll every client, so each instance's time is taken when it actually finishes
+        running = list(instances)
+        while running:
+            for inst in list(running):
+                if inst["client"].poll() is not None:
+                    inst["seconds"] = time.monotonic() - start
+                    running.remove(inst)
+            if running:
+                time.sleep(0.05)
+        wall = time.monotonic() - start
+    finally:
+        print("\nShutting down...")
+        stop_agents([p for inst in instances for p in inst["procs"]])
+
+    ok = [inst for inst in instances if inst["client"].returncode == 0]
+    for i, inst in enumerate(instances):
+        status = "ok" if inst["client"].returncode == 0 else f"failed (exit {inst['client'].returncode})"
+        print(f"  instance {i}: {status} in {inst['seconds']:.2f}s, {inst['dir']}")
+    print(f"{len(ok)}/{num_instances} assessments completed in {wall:.2f}s "
+          f"-> {len(ok) / wall:.3f} assessments/s ({60 * len(ok) / wall:.1f}/min)")
+    return len(ok) == num_instances
+
+
+async def run_scenario(scenario_path: str, env: dict[str, str] | None = None, output_path: Path | None = None,
+                       log_dir: Path | None = None, timeout: float = 30, echo=None) -> "AssessmentResult":
+    """Start a scenario's agents, run one assessment in this process and stop the agents.
+
+    For use from batch drivers. Agent output goes to `log_dir` if given and is
+    discarded otherwise; client updates are passed to `echo` (silent by default).
+    Raises AssessmentError if the assessment fails and RuntimeError if an agent
+    does not become ready.
+    """
+    from agentbeats.client_cli import run_assessment
+
+    cfg = parse_toml(scenario_path)
+    procs: list[subprocess.Popen] = []
+    try:
+        start_agents(cfg, env or agent_env(), subprocess.DEVNULL, procs, log_dir)
+        for agent in await probe_agents(cfg, timeout, procs):
+            if agent.ready_after is None:
+                raise RuntimeError(f"{agent.role} at {agent.endpoint}: {agent.describe()}")
+        return await run_assessment(scenario_path, output_path, echo)
+    finally:
+        await asyncio.to_thread(stop_agents, procs)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run agent scenario")
     parser.add_argument("scenario", help="Path to scenario TOML file")
@@ -102,82 +421,109 @@ def main():
                         help="Show agent stdout/stderr")
     parser.add_argument("--serve-only", action="store_true",
                         help="Start agent servers only without running evaluation")
+    parser.add_argument("--client-subprocess", action="store_true",
+                        help="Run the assessment client as a separate process instead of in-process")
+    parser.add_argument("-j", "--instances", type=int, default=1,
+                        help="Run this many isolated copies of the scenario side by side on free ports")
+    parser.add_argument("--log-dir", type=str,
+                        help="Directory for agent logs (and per-instance scenarios and results with --instances)")
+    parser.add_argument("--restart", choices=RESTART_POLICIES, default="never",
+                        help="Restart policy for agents without a `restart` key in the scenario")
+    parser.add_argument("--restart-backoff", type=float, default=1.0,
+                        help="Seconds before the first restart, doubled on each further restart")
+    parser.add_argument("--max-restart-backoff", type=float, default=60.0)
+    parser.add_argument("--max-restarts", type=int, help="Give up on an agent after this many restarts")
+    parser.add_argument("--sample-interval", type=float, default=2.0,
+                        help="Seconds between CPU/RSS/FD samples of the agent processes")
+    parser.add_argument("--stats-file", type=str,
+                        help="Append resource samples to this file as JSON lines")
+    parser.add_argument("--log-buffer-lines", type=int, default=2000,
+                        help="Lines of output kept per agent and printed if the run fails")
+    parser.add_argument("--log-max-bytes", type=int, default=10 * 2**20,
+                        help="Size at which agent log files in --log-dir are rotated")
+    parser.add_argument("--log-backups", type=int, default=3, help="Rotated log files kept per agent")
     args = parser.parse_args()
 
+    if args.instances > 1:
+        # Instances log to files and run without a supervisor, so these options would be ignored
+        single_run = ["show_logs", "serve_only", "client_subprocess", "restart", "restart_backoff",
+                      "max_restart_backoff", "max_restarts", "sample_interval", "stats_file",
+                      "log_buffer_lines", "log_max_bytes", "log_backups"]
+        ignored = [name for name in single_run if getattr(args, name) != parser.get_default(name)]
+        if ignored:
+            parser.error(f"--instances does not support {', '.join('--' + n.replace('_', '-') for n in ignored)}")
+        log_dir = Path(args.log_dir or tempfile.mkdtemp(prefix="agentbeats-"))
+        ok = False
+        try:
+            ok = run_instances(args.scenario, args.instances, agent_env(), log_dir)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0 if ok else 1)
+
     cfg = parse_toml(args.scenario)
+    restart = {p["role"]: p.get("restart") for p in cfg["participants"]}
+    restart["green_agent"] = cfg["green_agent"].get("restart")
+    policies = {
+        role: RestartPolicy(restart.get(role) or args.restart, args.restart_backoff, args.max_restart_backoff,
+                            max_restarts=args.max_restarts)
+        for role, _, _ in agent_commands(cfg)
+    }
 
-    sink = None if args.show_logs or args.serve_only else subprocess.DEVNULL
-    parent_bin = str(Path(sys.executable).parent)
-    base_env = os.environ.copy()
-    base_env["PATH"] = parent_bin + os.pathsep + base_env.get("PATH", "")
+    echo = args.show_logs or args.serve_only
+    mux = LogMux(args.log_buffer_lines, echo, Path(args.log_dir) if args.log_dir else None,
+                 args.log_max_bytes, args.log_backups)
+    base_env = agent_env()
+
+    def on_exit(role: str, code: int):
+        if code != 0 and not echo:
+            mux.dump([role], lines=50)
 
     procs = []
+    supervisor = Supervisor(args.sample_interval, Path(args.stats_file) if args.stats_file else None, procs, on_exit)
+    failed = False
     try:
-        # start participant agents
-        for p in cfg["participants"]:
-            cmd_args = shlex.split(p.get("cmd", ""))
-            if cmd_args:
-                print(f"Starting {p['role']} at {p['host']}:{p['port']}")
-                procs.append(subprocess.Popen(
-                    cmd_args,
-                    env=base_env,
-                    stdout=sink, stderr=sink,
-                    text=True,
-                    start_new_session=True,
-                ))
-
-        # start host
-        green_cmd_args = shlex.split(cfg["green_agent"].get("cmd", ""))
-        if green_cmd_args:
-            print(f"Starting green agent at {cfg['green_agent']['host']}:{cfg['green_agent']['port']}")
-            procs.append(subprocess.Popen(
-                green_cmd_args,
-                env=base_env,
-                stdout=sink, stderr=sink,
-                text=True,
-                start_new_session=True,
-            ))
+        start_agents(cfg, base_env, procs=procs, mux=mux)
+        for (role, _, cmd_args), proc in zip(agent_commands(cfg), list(procs)):
+            relaunch = functools.partial(launch_agent, role, cmd_args, base_env, mux=mux)
+            supervisor.add(role, proc, relaunch, policies[role])
 
         # Wait for all agents to be ready
-        if not asyncio.run(wait_for_agents(cfg)):
+        if not asyncio.run(wait_for_agents(cfg, procs=procs)):
             print("Error: Not all agents became ready. Exiting.")
+            failed = True
             return
 
         print("Agents started. Press Ctrl+C to stop.")
         if args.serve_only:
-            while True:
-                for proc in procs:
-                    if proc.poll() is not None:
-                        print(f"Agent exited with code {proc.returncode}")
-                        break
-                    time.sleep(0.5)
-        else:
+            asyncio.run(supervisor.run())
+        elif args.client_subprocess:
             client_proc = subprocess.Popen(
                 [sys.executable, "-m", "agentbeats.client_cli", args.scenario],
                 env=base_env,
                 start_new_session=True,
             )
             procs.append(client_proc)
-            client_proc.wait()
+            failed = asyncio.run(supervisor.during(asyncio.to_thread(client_proc.wait))) != 0
+        else:
+            from agentbeats.client_cli import run_client
+            failed = not asyncio.run(supervisor.during(run_client(Path(args.scenario))))
 
     except KeyboardInterrupt:
         pass
 
+    except Exception:
+        failed = True
+        raise
+
     finally:
         print("\nShutting down...")
-        for p in procs:
-            if p.poll() is None:
-                try:
-                    os.killpg(p.pid, signal.SIGTERM)
-                except ProcessLookupError:
-                    pass
-        time.sleep(1)
-        for p in procs:
-            if p.poll() is None:
-                try:
-                    os.killpg(p.pid, signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
+        supervisor.close()
+        if supervisor.agents:
+            supervisor.print_summary()
+        stop_agents(procs)
+        mux.close()
+        if failed and not echo:
+            mux.dump()
 
 
 if __name__ == "__main__":
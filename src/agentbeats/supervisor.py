@@ -0,0 +1,224 @@
+"""Supervision of launched agents: restart policies and resource sampling.
+
+`Supervisor` watches each agent process started by `agentbeats-run`. When an
+agent exits, it is restarted according to its policy:
+- "never": report the exit and leave the agent down (the default)
+- "on-failure": restart after a non-zero exit code or a signal
+- "always": restart after any exit
+
+Restarts back off exponentially from `backoff` up to `max_backoff` seconds.
+The delay resets once an incarnation has stayed up for `stable_after` seconds.
+The supervisor also samples CPU time, RSS and open file descriptors of every
+agent's process group (see procstats), and can append each sample as a JSON
+line to a time-series file for soak runs. `summary()` aggregates the samples
+over all incarnations of each agent.
+"""
+import asyncio
+import json
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from agentbeats.procstats import GroupStats
+
+
+RESTART_POLICIES = ("never", "on-failure", "always")
+
+
+@dataclass
+class RestartPolicy:
+    mode: str = "never"
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    stable_after: float = 60.0  # seconds of uptime after which the backoff resets
+    max_restarts: int | None = None
+
+    def __post_init__(self):
+        if self.mode not in RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy {self.mode!r}, expected one of {', '.join(RESTART_POLICIES)}")
+
+    def wants_restart(self, returncode: int) -> bool:
+        return self.mode == "always" or (self.mode == "on-failure" and returncode != 0)
+
+
+@dataclass
+class SupervisedAgent:
+    role: str
+    proc: subprocess.Popen
+    relaunch: Callable[[], subprocess.Popen]
+    policy: RestartPolicy
+    started: float = field(default_factory=time.monotonic)
+    restarts: int = 0
+    exits: list[int] = field(default_factory=list)
+    delay: float = 0.0  # backoff before the next restart
+    restart_at: float | None = None  # monotonic time of a pending restart
+    incarnations: list[GroupStats] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.delay = self.policy.backoff
+        self.incarnations.append(GroupStats(self.proc.pid))
+
+    @property
+    def status(self) -> str:
+        if self.proc.poll() is None:
+            return "running"
+        if self.restart_at is not None:
+            return "restarting"
+        return f"exited ({self.proc.returncode})"
+
+
+class Supervisor:
+
+    def __init__(self, interval: float = 2.0, timeseries: Path | None = None, procs: list[subprocess.Popen] | None = None,
+                 on_exit: Callable[[str, int], None] | None = None):
+        self.interval = interval
+        self.timeseries = timeseries
+        self.procs = procs if procs is not None else []  # every process launched, for cleanup
+        self.on_exit = on_exit  # called with (role, exit code) when an agent exits
+        self.agents: list[SupervisedAgent] = []
+        self._series = None
+
+    def add(self, role: str, proc: subprocess.Popen, relaunch: Callable[[], subprocess.Popen],
+            policy: RestartPolicy | None = None) -> None:
+        """Supervises `proc`; `relaunch()` starts a replacement process for the same agent."""
+        self.agents.append(SupervisedAgent(role, proc, relaunch, policy or RestartPolicy()))
+
+    @property
+    def active(self) -> bool:
+        """Whether any agent is running or waiting to be restarted."""
+        return any(a.proc.poll() is None or a.restart_at is not None for a in self.agents)
+
+    def _check(self, agent: SupervisedAgent, now: float) -> None:
+        if agent.restart_at is not None:
+            if now >= agent.restart_at:
+                agent.restart_at = None
+                agent.restarts += 1
+                agent.proc = agent.relaunch()
+                agent.started = now
+                agent.incarnations.append(GroupStats(agent.proc.pid))
+                self.procs.append(agent.proc)
+                print(f"Restarted {agent.role} (restart {agent.restarts}, pid {agent.proc.pid})")
+            return
+        if agent.proc.poll() is None or len(agent.exits) > agent.restarts:
+            return  # running, or its exit was already handled
+
+        code = agent.proc.returncode
+        uptime = now - agent.started
+        agent.exits.append(code)
+        if self.on_exit:
+            self.on_exit(agent.role, code)
+        policy = agent.policy
+        if not policy.wants_restart(code):
+            print(f"{agent.role} exited with code {code} after {uptime:.1f}s")
+            return
+        if policy.max_restarts is not None and agent.restarts >= policy.max_restarts:
+            print(f"{agent.role} exited with code {code} after {uptime:.1f}s, giving up after {agent.restarts} restarts")
+            return
+        if uptime >= policy.stable_after:
+            agent.delay = policy.backoff
+        agent.restart_at = now + agent.delay
+        print(f"{agent.role} exited with code {code} after {uptime:.1f}s, restarting in {agent.delay:.1f}s")
+        agent.delay = min(agent.delay * 2, policy.max_backoff)
+
+    def _sample(self, agent: SupervisedAgent) -> None:
+        stats = agent.incarnations[-1]
+        previous = stats.samples[-1] if stats.samples else None
+        sample = stats.sample()
+        if sample is None or self._series is None:
+            return
+        cpu_percent = None
+        if previous and sample.timestamp > previous.timestamp:
+            cpu_percent = round(100 * (sample.cpu_seconds - previous.cpu_seconds) / (sample.timestamp - previous.timestamp), 1)
+        self._series.write(json.dumps({
+            "timestamp": round(sample.timestamp, 3),
+            "role": agent.role,
+            "pid": agent.proc.pid,
+            "restarts": agent.restarts,
+            "cpu_seconds": round(sample.cpu_seconds, 3),
+            "cpu_percent": cpu_percent,
+            "rss_mb": round(sample.rss_bytes / 2**20, 1),
+            "fds": sample.num_fds,
+            "procs": sample.num_procs,
+        }) + "\n")
+
+    def poll(self) -> None:
+        """Handles exits and due restarts, then samples every running agent."""
+        now = time.monotonic()
+        for agent in self.agents:
+            self._check(agent, now)
+            if agent.proc.poll() is None:
+                self._sample(agent)
+        if self._series:
+            self._series.flush()
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Supervises until `stop` is set, or until no agent is running or about to restart."""
+        stop = stop or asyncio.Event()
+        if self.timeseries and self._series is None:
+            self.timeseries.parent.mkdir(parents=True, exist_ok=True)
+            self._series = open(self.timeseries, "a")
+        while True:
+            self.poll()
+            if not self.active:
+                print("All agents have exited")
+                return
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    async def during(self, aw):
+        """Awaits `aw` while supervising in the background."""
+        stop = asyncio.Event()
+        task = asyncio.create_task(self.run(stop))
+        try:
+            return await aw
+        finally:
+            stop.set()
+            await task
+
+    def close(self) -> None:
+        if self._series:
+            self._series.close()
+            self._series = None
+
+    def summary(self) -> list[dict[str, Any]]:
+        rows = []
+        for agent in self.agents:
+            cpu = wall = 0.0
+            rss: list[int] = []
+            fds_peak = samples = 0
+            for stats in agent.incarnations:
+                if not stats.samples:
+                    continue
+                first, last = stats.samples[0], stats.samples[-1]
+                cpu += max(0.0, last.cpu_seconds - first.cpu_seconds)
+                wall += last.timestamp - first.timestamp
+                rss.extend(s.rss_bytes for s in stats.samples)
+                fds_peak = max(fds_peak, max(s.num_fds for s in stats.samples))
+                samples += len(stats.samples)
+            rows.append({
+                "role": agent.role,
+                "status": agent.status,
+                "restarts": agent.restarts,
+                "exit_codes": agent.exits,
+                "cpu_seconds": round(cpu, 3),
+                "cpu_percent": round(100 * cpu / wall, 1) if wall > 0 else 0.0,
+                "rss_peak_mb": round(max(rss) / 2**20, 1) if rss else 0.0,
+                "rss_mean_mb": round(sum(rss) / len(rss) / 2**20, 1) if rss else 0.0,
+                "fds_peak": fds_peak,
+                "samples": samples,
+            })
+        return rows
+
+    def print_summary(self) -> None:
+        print(f"  {'role':20s} {'status':14s} {'restarts':>8s} {'cpu s':>8s} {'cpu %':>6s} "
+              f"{'rss peak':>9s} {'rss mean':>9s} {'fds':>5s}")
+        for row in self.summary():
+            print(f"  {row['role']:20s} {row['status']:14s} {row['restarts']:>8d} {row['cpu_seconds']:>8.2f} "
+                  f"{row['cpu_percent']:>6.1f} {row['rss_peak_mb']:>7.1f}MB {row['rss_mean_mb']:>7.1f}MB {row['fds_peak']:>5d}")
+        if self.timeseries:
+            print(f"Resource samples written to {self.timeseries}")
@@ -0,0 +1,235 @@
+"""Repeated and parameter-sweep assessments with aggregated statistics.
+
+A `[sweep]` table in the scenario TOML turns one assessment into a matrix of
+assessments. Each value list in `[sweep.grid]` is one axis. Every combination
+is merged over `[config]` and submitted `repeat` times, with at most
+`concurrency` assessments in flight:
+
+    [sweep]
+    repeat = 5
+    concurrency = 4
+    categorical = ["winner"]   # result fields reported as rates (default: winner)
+
+    [sweep.grid]
+    topic = ["Should AI be regulated?", "Should remote work be the default?"]
+    num_rounds = [1, 3]
+
+Numeric (and boolean) fields of each assessment's results are aggregated per
+grid point and overall as mean, standard deviation and a 95% confidence
+interval (Student's t). Categorical fields and the completion rate are
+reported as proportions with Wilson score intervals. Nested fields are
+flattened with dots, e.g. `detail.pro_debater.total_score`.
+
+With a `.jsonl` output path, each run is written as a "run" record as soon as
+it finishes, and the aggregates follow in a final "summary" record.
+"""
+import asyncio
+import itertools
+import json
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from agentbeats.client_cli import AssessmentError, ResultsWriter, parse_toml, run_assessment
+
+
+Z_95 = 1.959964
+# Two-sided 95% critical values of Student's t for 1..30 degrees of freedom
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t_critical(df: int) -> float:
+    if df <= len(T_95):
+        return T_95[df - 1]
+    return Z_95 + (Z_95 ** 3 + Z_95) / (4 * df)  # Cornish-Fisher approximation
+
+
+def mean_ci(values: list[float]) -> dict[str, Any]:
+    n = len(values)
+    mean = statistics.fmean(values)
+    std = statistics.stdev(values) if n > 1 else 0.0
+    half = t_critical(n - 1) * std / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "mean": round(mean, 4),
+        "std": round(std, 4),
+        "ci95": [round(mean - half, 4), round(mean + half, 4)],
+        "n": n,
+    }
+
+
+def wilson_ci(successes: int, n: int) -> dict[str, Any]:
+    if n == 0:
+        return {"rate": None, "ci95": None, "count": 0, "n": 0}
+    p = successes / n
+    denom = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denom
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denom
+    return {"rate": round(p, 4), "ci95": [round(center - half, 4), round(center + half, 4)], "count": successes, "n": n}
+
+
+def flatten(value: Any, prefix: str = "") -> dict[str, Any]:
+    """Leaves of nested dicts keyed by dotted path."""
+    if isinstance(value, dict):
+        flat = {}
+        for k, v in value.items():
+            flat.update(flatten(v, f"{prefix}{k}."))
+        return flat
+    return {prefix[:-1]: value} if prefix else {}
+
+
+@dataclass
+class SweepRun:
+    index: int
+    params: dict[str, Any]
+    repeat: int
+    state: str = "pending"
+    seconds: float | None = None
+    results: list = field(default_factory=list)
+    error: str | None = None
+    fields: dict[str, Any] = field(default_factory=dict)  # scalar result fields by dotted path
+
+    def collect(self, results: list) -> None:
+        self.results = results
+        for item in results:
+            if isinstance(item, dict):
+                self.fields.update((k, v) for k, v in flatten(item).items() if isinstance(v, (str, bool, int, float)))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "params": self.params,
+            "repeat": self.repeat,
+            "state": self.state,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "results": self.results,
+            "error": self.error,
+        }
+
+
+def expand_sweep(sweep: dict[str, Any]) -> list[SweepRun]:
+    """Every combination of the `grid` values, `repeat` times, in submission order."""
+    grid = sweep.get("grid", {})
+    for key, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"sweep.grid.{key} must be a non-empty list")
+    repeat = int(sweep.get("repeat", 1))
+    if repeat < 1:
+        raise ValueError("sweep.repeat must be at least 1")
+    points = [dict(zip(grid, combo)) for combo in itertools.product(*grid.values())]
+    runs = []
+    for r in range(repeat):
+        for params in points:
+            runs.append(SweepRun(len(runs), params, r))
+    return runs
+
+
+def aggregate(runs: list[SweepRun], categorical: list[str]) -> dict[str, Any]:
+    completed = [r for r in runs if r.state == "completed"]
+    numeric: dict[str, list[float]] = {}
+    categories: dict[str, dict[str, int]] = {key: {} for key in categorical}
+    for run in completed:
+        for key, value in run.fields.items():
+            if key in categories:
+                categories[key][str(value)] = categories[key].get(str(value), 0) + 1
+            elif isinstance(value, (bool, int, float)):
+                numeric.setdefault(key, []).append(float(value))
+    return {
+        "runs": len(runs),
+        "completed": wilson_ci(len(completed), len(runs)),
+        "metrics": {key: mean_ci(values) for key, values in sorted(numeric.items())},
+        "outcomes": {
+            key: {value: wilson_ci(count, len(completed)) for value, count in sorted(counts.items())}
+            for key, counts in categories.items() if counts
+        },
+        "seconds": mean_ci([r.seconds for r in completed]) if completed else None,
+    }
+
+
+def summarize(runs: list[SweepRun], categorical: list[str], participants: dict[str, str], sweep: dict[str, Any],
+              concurrency: int, wall: float) -> dict[str, Any]:
+    """Aggregates per grid point and over all runs."""
+    key = lambda r: json.dumps(r.params, sort_keys=True)
+    points = [{"params": json.loads(params), **aggregate(list(group), categorical)}
+              for params, group in itertools.groupby(sorted(runs, key=key), key=key)]
+    return {
+        "participants": participants,
+        "sweep": {**sweep, "concurrency": concurrency},
+        "wall_seconds": round(wall, 3),
+        "overall": aggregate(runs, categorical),
+        "points": points,
+    }
+
+
+async def run_sweep(data: dict[str, Any], output_path: Path | None = None, concurrency: int | None = None,
+                    echo: Callable[[str], None] | None = print) -> dict[str, Any]:
+    """Runs every assessment of the scenario's `[sweep]` and returns the aggregated report.
+
+    `data` is the parsed scenario TOML; `concurrency` overrides `sweep.concurrency`.
+    """
+    sweep = data["sweep"]
+    runs = expand_sweep(sweep)
+    categorical = list(sweep.get("categorical", ["winner"]))
+    concurrency = concurrency or int(sweep.get("concurrency", 1))
+    limit = asyncio.Semaphore(concurrency)
+    base_config = data.get("config", {}) or {}
+    _, _, role_to_id = parse_toml(data)
+    show = echo or (lambda _: None)
+    writer = ResultsWriter(output_path) if output_path and output_path.suffix == ".jsonl" else None
+    done = 0
+
+    async def run_one(run: SweepRun):
+        nonlocal done
+        scenario = {**data, "config": {**base_config, **run.params}}
+        async with limit:
+            start = time.monotonic()
+            try:
+                result = await run_assessment(scenario, echo=None)
+                run.state = "completed"
+                run.collect(result.results())
+            except AssessmentError as e:
+                run.state, run.error = e.state, str(e)
+            except Exception as e:
+                run.state, run.error = "error", f"{type(e).__name__}: {e}"
+            run.seconds = time.monotonic() - start
+        done += 1
+        if writer:
+            writer.write({"type": "run", **run.to_dict()})
+            run.results = []  # streamed; only the scalar fields are kept for the summary
+        params = " ".join(f"{k}={v!r}" for k, v in run.params.items())
+        show(f"[{done}/{len(runs)}] {params} #{run.repeat}: {run.state} in {run.seconds:.1f}s"
+             + (f" ({run.error})" if run.error else ""))
+
+    repeat = int(sweep.get("repeat", 1))
+    show(f"Running {len(runs)} assessments ({len(runs) // repeat} grid points x {repeat} repeats),"
+         f" {concurrency} at a time")
+    start = time.monotonic()
+    try:
+        await asyncio.gather(*(run_one(run) for run in runs))
+    finally:
+        report = summarize(runs, categorical, role_to_id, sweep, concurrency, time.monotonic() - start)
+        if writer:
+            writer.write({"type": "summary", **report})
+            writer.close()
+    report["runs"] = [run.to_dict() for run in runs]
+
+    overall = report["overall"]
+    show(f"{overall['completed']['count']}/{len(runs)} assessments completed in {report['wall_seconds']:.1f}s")
+    for point in report["points"]:
+        params = " ".join(f"{k}={v!r}" for k, v in point["params"].items()) or "(no grid)"
+        summary = [f"completed {point['completed']['rate']:.0%}"]
+        for key, values in point["outcomes"].items():
+            summary.extend(f"{key}={value} {stats['rate']:.0%} [{stats['ci95'][0]:.2f}, {stats['ci95'][1]:.2f}]"
+                           for value, stats in values.items())
+        show(f"  {params}: " + ", ".join(summary))
+
+    if output_path:
+        if not writer:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(report, indent=2))
+        show(f"Results written to {output_path}")
+    return report
@@ -1,9 +1,17 @@
-from agentbeats.client import send_message
+from agentbeats.client import DEFAULT_TIMEOUT, send_message
+from agentbeats.health import HealthRegistry
 
 
 class ToolProvider:
-    def __init__(self):
+    def __init__(self, health: HealthRegistry | None = None, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            health: If given, calls go through its circuit breakers and fail fast for unavailable agents
+            timeout: Seconds to wait for each response
+        """
         self._context_ids = {}
+        self._health = health
+        self._timeout = timeout
 
     async def talk_to_agent(self, message: str, url: str, new_conversation: bool = False):
         """
@@ -17,9 +25,18 @@ class ToolProvider:
         Returns:
             str: The agent's response message
         """
-        outputs = await send_message(message=message, base_url=url, context_id=None if new_conversation else self._context_ids.get(url, None))
-        if outputs.get("status", "completed") != "completed":
-            raise RuntimeError(f"{url} responded with: {outputs}")
+        context_id = None if new_conversation else self._context_ids.get(url, None)
+
+        async def call():
+            outputs = await send_message(message=message, base_url=url, context_id=context_id, timeout=self._timeout)
+            if outputs.get("status", "completed") != "completed":
+                raise RuntimeError(f"{url} responded with: {outputs}")
+            return outputs
+
+        if self._health:
+            outputs = await self._health.call(url, call, timeout=self._timeout)
+        else:
+            outputs = await call()
         self._context_ids[url] = outputs.get("context_id", None)
         return outputs["response"]
 
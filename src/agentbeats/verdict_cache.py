@@ -0,0 +1,131 @@
+"""Cache of judge verdicts.
+
+Judges re-run their most expensive step, the verdict LLM call, even when a
+transcript is byte-identical to one they judged before (templated debaters,
+regression reruns). `VerdictCache` stores verdicts under a key built from the
+judge model, a prompt version, the topic and a hash of the normalized
+transcript, in an in-memory LRU with an optional on-disk store shared across
+restarts. The cache is off unless one of these is set:
+
+    AGENTBEATS_VERDICT_CACHE_SIZE=256          # in-memory entries (default 256 with a directory, else 0)
+    AGENTBEATS_VERDICT_CACHE_DIR=.verdict_cache  # optional on-disk store
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger("agentbeats.verdict_cache")
+
+SIZE_ENV = "AGENTBEATS_VERDICT_CACHE_SIZE"
+DIR_ENV = "AGENTBEATS_VERDICT_CACHE_DIR"
+DEFAULT_SIZE = 256
+
+
+def normalize_transcript(text: str) -> str:
+    """Unicode NFC with runs of whitespace collapsed to single spaces."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def transcript_hash(text: str) -> str:
+    return hashlib.sha256(normalize_transcript(text).encode()).hexdigest()
+
+
+def prompt_version(*prompts: str) -> str:
+    """Short fingerprint of the prompt texts, so editing a prompt invalidates its cached verdicts."""
+    return hashlib.sha256("\0".join(prompts).encode()).hexdigest()[:12]
+
+
+class VerdictCache:
+
+    def __init__(self, size: int = DEFAULT_SIZE, directory: str | Path | None = None):
+        self.size = size
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "VerdictCache":
+        directory = os.getenv(DIR_ENV) or None
+        return cls(size=int(os.getenv(SIZE_ENV) or (DEFAULT_SIZE if directory else 0)), directory=directory)
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 or self.directory is not None
+
+    @staticmethod
+    def key(model: str, version: str, topic: str, transcript: str, *extra: Any) -> str:
+        """Cache key of a verdict; `extra` distinguishes e.g. per-round or panel verdicts."""
+        parts = [model, version, normalize_transcript(topic), transcript_hash(transcript), *extra]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if self.directory:
+            try:
+                value = json.loads(self._path(key).read_text())
+            except (OSError, ValueError):
+                pass
+            else:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a JSON-serializable verdict."""
+        self._remember(key, value)
+        if self.directory:
+            path = self._path(key)
+            tmp = None
+            try:
+                path.parent.mkdir(exist_ok=True)
+                # Write then rename, so concurrent readers never see a partial file
+                with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, suffix=".tmp") as f:
+                    tmp = f.name
+                    json.dump(value, f)
+                os.replace(tmp, path)
+                tmp = None
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not write verdict to {path}: {e}")
+            finally:
+                if tmp:
+                    with contextlib.suppress(OSError):
+                        os.unlink(tmp)
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
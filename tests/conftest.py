@@ -0,0 +1,16 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+DEBATE_DIR = Path(__file__).resolve().parent.parent / "scenarios" / "debate"
+
+
+@pytest.fixture(scope="session")
+def a2a_judge():
+    """The A2A debate judge module, whose file name is not importable as is."""
+    spec = importlib.util.spec_from_file_location("debate_judge_copy", DEBATE_DIR / "debate_judge copy.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,22 @@
+import asyncio
+
+import httpx
+import pytest
+
+import debate_judge
+
+
+def test_error_status_counts_as_a_debater_failure():
+    judge = debate_judge.DebateJudge()
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+    async def turn():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await judge.health.call("http://pro", lambda: judge._request_argument(
+                client, "http://pro", "topic", 1, ""))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(turn())
+    health = judge.health.get("http://pro").to_dict()
+    assert health["total_calls"] == 1
+    assert health["total_failures"] == 1
@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+import litellm
+
+from agentbeats.llm import LLMGateway
+
+
+VERDICT = (
+    '{"pro_debater": {"emotional_appeal": 0.5, "argument_clarity": 0.5, "argument_arrangement": 0.5,'
+    ' "relevance_to_topic": 0.5, "total_score": 0.5},'
+    ' "con_debater": {"emotional_appeal": 0.5, "argument_clarity": 0.5, "argument_arrangement": 0.5,'
+    ' "relevance_to_topic": 0.5, "total_score": 0.5},'
+    ' "winner": "pro_debater", "reason": "stub"}'
+)
+
+
+def test_panel_samples_are_not_cached(a2a_judge, monkeypatch):
+    calls = []
+
+    async def acompletion(model, messages, **kwargs):
+        calls.append(kwargs.get("seed"))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=VERDICT))], usage=None)
+
+    monkeypatch.setattr(litellm, "acompletion", acompletion)
+    llm = LLMGateway(cache_size=64)
+    panel = a2a_judge.JudgePanel(size=3, models=["openai/gpt-4o"])
+
+    for _ in range(2):
+        asyncio.run(panel.evaluate(llm, "system", "same transcript"))
+
+    assert sorted(calls) == [0, 0, 1, 1, 2, 2]
+
+
+def test_deterministic_structured_calls_are_cached(monkeypatch):
+    calls = []
+
+    async def acompletion(model, messages, **kwargs):
+        calls.append(model)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=VERDICT))], usage=None)
+
+    monkeypatch.setattr(litellm, "acompletion", acompletion)
+    llm = LLMGateway(cache_size=64)
+    from debate_judge_common import DebateEval
+
+    for _ in range(2):
+        asyncio.run(llm.generate_structured("openai/gpt-4o", "system", "prompt", DebateEval, temperature=0))
+
+    assert len(calls) == 1
@@ -0,0 +1,18 @@
+from a2a.types import Artifact, DataPart, Part, TextPart
+
+from agentbeats.client_cli import format_parts, result_parts
+
+
+def artifact(name: str, *parts: Part) -> Artifact:
+    return Artifact(artifact_id=name, name=name, parts=list(parts))
+
+
+def test_result_artifact_json_text_is_data():
+    result = artifact("Result", Part(root=TextPart(text='{"winner": "pro"}')), Part(root=DataPart(data={"score": 1})))
+    assert result_parts(result) == [{"winner": "pro"}, {"score": 1}]
+
+
+def test_json_like_text_elsewhere_stays_text():
+    notes = artifact("Notes", Part(root=TextPart(text="[1] cites a study")), Part(root=TextPart(text='{"a": 1}')))
+    assert result_parts(notes) == []
+    assert '{"a": 1}' in format_parts([Part(root=TextPart(text='{"a": 1}'))])
@@ -0,0 +1,48 @@
+import asyncio
+
+import debate_judge
+
+
+PARTICIPANTS = {"pro_debater": "http://pro", "con_debater": "http://con"}
+
+
+class RecordingProvider:
+    """Stands in for ToolProvider; every debater answers with a numbered argument."""
+
+    def __init__(self):
+        self.prompts: dict[str, list[str]] = {"http://pro": [], "http://con": []}
+
+    async def talk_to_agent(self, prompt: str, url: str, new_conversation: bool = False) -> str:
+        self.prompts[url].append(prompt)
+        return f"{url} argument {len(self.prompts[url])}"
+
+
+def test_a2a_judge_shows_con_the_pro_opening(a2a_judge):
+    provider = RecordingProvider()
+    judge = a2a_judge.DebateJudge()
+    asyncio.run(judge.orchestrate_debate(PARTICIPANTS, "topic", 2, None, provider, opening_mode="simultaneous"))
+
+    con_opening, con_rebuttal = provider.prompts["http://con"]
+    assert "http://pro argument 1" not in con_opening
+    assert "http://pro argument 1" in con_rebuttal
+    assert "http://pro argument 2" in con_rebuttal
+    assert "http://con argument 1" in provider.prompts["http://pro"][1]
+
+
+def test_fastapi_judge_shows_con_the_pro_opening(monkeypatch):
+    judge = debate_judge.DebateJudge()
+    requests = []
+
+    async def request_argument(client, url, topic, round_num, previous):
+        requests.append((url, round_num, previous))
+        return f"{url} argument {round_num}"
+
+    monkeypatch.setattr(judge, "_request_argument", request_argument)
+    asyncio.run(judge._orchestrate_debate(
+        {"pro_debater": "http://pro", "con_debater": "http://con"},
+        {"topic": "topic", "num_rounds": 2, "opening_mode": "simultaneous"}))
+
+    con = {round_num: previous for url, round_num, previous in requests if url == "http://con"}
+    assert con[1] == ""
+    assert "http://pro argument 1" in con[2]
+    assert "http://pro argument 2" in con[2]
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+from tournament import Match, run_tournament
+
+from agentbeats.models import EvalRequest
+
+
+def tournament_request(**config) -> EvalRequest:
+    return EvalRequest(
+        participants={"a": "http://a", "b": "http://b"},
+        config={"mode": "tournament", "topics": ["topic"], "num_rounds": 1, **config},
+    )
+
+
+@pytest.mark.parametrize("config", [{"max_matches_per_debater": 0}, {"max_matches_per_debater": -1},
+                                    {"max_concurrent_matches": -1}])
+def test_invalid_tournament_limits_are_rejected(a2a_judge, config):
+    ok, message = a2a_judge.DebateJudge().validate_request(tournament_request(**config))
+    assert not ok
+    assert "max_" in message
+
+
+def test_run_tournament_fails_clearly_when_no_match_can_start():
+    async def play(match):
+        pass
+
+    async def on_result(match):
+        pass
+
+    with pytest.raises(ValueError, match="can start"):
+        asyncio.run(run_tournament([Match(0, "topic", "a", "b")], play, on_result, max_per_debater=0))